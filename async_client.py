@@ -1,1064 +1,1513 @@
-import asyncio
-import aiohttp
-import json
-import time
-import uuid
-import logging
-from typing import Dict, Any, Optional, AsyncGenerator, List, Union
-
-from .exceptions import (
-    MCPError, MCPAuthError, MCPConnectionError, 
-    MCPTimeoutError, MCPProtocolError, MCPExecutionError
-)
-from .models import (
-    ExecutionRequest, ExecutionResult, 
-    GenerationRequest, GenerationResult, 
-    StreamGenerationChunk, TokenUsage,
-    MCPSubmitJobRequest, MCPSubmitJobResponse,
-    MCPJobStatusRequest, MCPJobStatusResponse,
-    MCPCancelJobRequest, MCPCancelJobResponse,
-    MCPCodeExecutionRequest, MCPCodeExecutionResult,
-    MCPTextGenerationRequest, MCPTextGenerationResult,
-    MCPStreamGenerationChunk, MCPJobStatus
-)
-from .protocols.mcp import (
-    build_request_message, parse_response_message,
-    MCPRequestType, MCPResponseType,
-    CreateSessionInput, CodeExecutionInput, TextGenerationInput,
-    TextGenerationMetadata
-)
-
-
-class DeepExecAsyncClient:
-    """Asynchronous client for interacting with the DeepExec service."""
-
-    def __init__(
-        self,
-        endpoint: str = "https://api.deepexec.com/v1",
-        deepseek_key: Optional[str] = None,
-        e2b_key: Optional[str] = None,
-        timeout: float = 30.0,
-        max_retries: int = 3,
-        retry_delay: float = 1.0,
-        verify_ssl: bool = True,
-    ):
-        """Initialize the asynchronous DeepExec client.
-
-        Args:
-            endpoint: The API endpoint URL.
-            deepseek_key: The DeepSeek API key for authentication.
-            e2b_key: The E2B API key for code execution.
-            timeout: Request timeout in seconds.
-            max_retries: Maximum number of retry attempts for failed requests.
-            retry_delay: Base delay between retries in seconds.
-            verify_ssl: Whether to verify SSL certificates.
-        """
-        self.endpoint = endpoint
-        self.deepseek_key = deepseek_key
-        self.e2b_key = e2b_key
-        self.timeout = timeout
-        self.max_retries = max_retries
-        self.retry_delay = retry_delay
-        self.verify_ssl = verify_ssl
-        
-        self.session = None
-        self.session_id = None
-        self._headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        
-        if deepseek_key:
-            self._headers["X-DeepSeek-Key"] = deepseek_key
-        if e2b_key:
-            self._headers["X-E2B-Key"] = e2b_key
-            
-        # 初始化日志记录器
-        self.logger = logging.getLogger("deepexec.async_client")
-        self.logger.setLevel(logging.DEBUG)
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-
-    async def __aenter__(self):
-        """Async context manager entry."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession(
-                headers=self._headers,
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            )
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self.session:
-            await self.session.close()
-            self.session = None
-        self.session_id = None
-
-    async def create_session(self, user_id: str) -> str:
-        """Create a new session with the DeepExec service.
-
-        Args:
-            user_id: Identifier for the user creating the session.
-
-        Returns:
-            The session ID.
-
-        Raises:
-            MCPAuthError: If authentication fails.
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-        """
-        if not self.deepseek_key or not self.e2b_key:
-            raise MCPAuthError("Both DeepSeek and E2B API keys are required")
-
-        if self.session is None:
-            await self.__aenter__()
-
-        request_data = build_request_message(
-            type=MCPRequestType.CREATE_SESSION,
-            session_id=None,  # No session ID yet
-            input=CreateSessionInput(user_id=user_id),
-            metadata={}
-        )
-
-        self.logger.debug("Creating new session with user ID %s", user_id)
-
-        response = await self._send_request(
-            "sessions",
-            request_data
-        )
-
-        self.session_id = response.get("session_id")
-        if not self.session_id:
-            raise MCPProtocolError("Failed to create session: No session ID returned")
-
-        self.logger.debug("Created new session with ID %s", self.session_id)
-
-        return self.session_id
-
-    async def execute_code(
-        self,
-        code: str,
-        language: str,
-        environment: Optional[Dict[str, str]] = None,
-        working_directory: Optional[str] = None,
-        timeout: Optional[float] = None
-    ) -> ExecutionResult:
-        """Execute code asynchronously.
-
-        Args:
-            code: The code to execute.
-            language: The programming language of the code.
-            environment: Optional environment variables for the execution.
-            working_directory: Optional working directory for the execution.
-            timeout: Optional timeout for this specific execution.
-
-        Returns:
-            ExecutionResult object containing the execution results.
-
-        Raises:
-            MCPProtocolError: If there's an issue with the protocol.
-            MCPExecutionError: If code execution fails.
-            MCPTimeoutError: If the execution times out.
-            MCPConnectionError: If connection to the server fails.
-        """
-        if not self.session_id:
-            raise MCPProtocolError("No active session. Call create_session() first.")
-
-        if not code.strip():
-            raise MCPProtocolError("Code cannot be empty")
-
-        # Validate the request using Pydantic model
-        request = ExecutionRequest(
-            code=code,
-            language=language,
-            environment=environment or {},
-            working_directory=working_directory or "/home/user"
-        )
-
-        request_data = build_request_message(
-            type=MCPRequestType.CODE_EXECUTION,
-            session_id=self.session_id,
-            input=CodeExecutionInput(
-                code=request.code,
-                language=request.language,
-                environment=request.environment,
-                working_directory=request.working_directory
-            ),
-            metadata={}
-        )
-
-        # Use the provided timeout if specified, otherwise use the client's default
-        current_timeout = timeout or self.timeout
-
-        self.logger.debug("Executing code with language %s and timeout %s", language, current_timeout)
-
-        try:
-            response = await self._send_request(
-                "execute",
-                request_data,
-                timeout=current_timeout
-            )
-
-            # Parse the execution result
-            result = ExecutionResult(
-                output=response.get("output", ""),
-                exit_code=response.get("exitCode", 1),
-                execution_time=response.get("executionTime", 0),
-                memory_usage=response.get("memoryUsage", 0),
-                metadata=response.get("metadata", {})
-            )
-            return result
-
-        except MCPTimeoutError:
-            # Attempt to cancel the execution if it timed out
-            if self.session_id:
-                try:
-                    await self._cancel_execution(self.session_id)
-                except Exception:
-                    # Ignore errors when canceling, as we're already handling a timeout
-                    pass
-            raise
-
-    async def generate_text(
-        self,
-        prompt: str,
-        model: str = "deepseek-v3",
-        max_tokens: int = 1000,
-        temperature: float = 0.7,
-        timeout: Optional[float] = None
-    ) -> GenerationResult:
-        """Generate text asynchronously using the DeepSeek model.
-
-        Args:
-            prompt: The input prompt for text generation.
-            model: The model to use for generation.
-            max_tokens: Maximum number of tokens to generate.
-            temperature: Sampling temperature (0.0-1.0).
-            timeout: Optional timeout for this specific generation.
-
-        Returns:
-            GenerationResult object containing the generated text and metadata.
-
-        Raises:
-            MCPProtocolError: If there's an issue with the protocol.
-            MCPTimeoutError: If the generation times out.
-            MCPConnectionError: If connection to the server fails.
-        """
-        if not self.session_id:
-            raise MCPProtocolError("No active session. Call create_session() first.")
-
-        if not prompt.strip():
-            raise MCPProtocolError("Prompt cannot be empty")
-
-        # Validate the request using Pydantic model
-        request = GenerationRequest(
-            prompt=prompt,
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-
-        request_data = build_request_message(
-            type=MCPRequestType.TEXT_GENERATION,
-            session_id=self.session_id,
-            input=TextGenerationInput(
-                prompt=request.prompt,
-                max_tokens=request.max_tokens,
-                temperature=request.temperature
-            ),
-            metadata=TextGenerationMetadata(model=request.model)
-        )
-
-        # Use the provided timeout if specified, otherwise use the client's default
-        current_timeout = timeout or self.timeout
-
-        self.logger.debug("Generating text with model %s and timeout %s", model, current_timeout)
-
-        response = await self._send_request(
-            "generate",
-            request_data,
-            timeout=current_timeout
-        )
-
-        # Parse the generation result
-        result = GenerationResult(
-            text=response.get("text", ""),
-            model=response.get("model", model),
-            generation_time=response.get("generationTime", 0),
-            usage=response.get("usage", {
-                "promptTokens": 0,
-                "completionTokens": 0,
-                "totalTokens": 0
-            })
-        )
-        return result
-
-    async def stream_generate_text(
-        self,
-        prompt: str,
-        model: str = "deepseek-v3",
-        max_tokens: int = 1000,
-        temperature: float = 0.7
-    ) -> AsyncGenerator[Dict[str, Any], None]:
-        """Generate text with streaming response.
-
-        Args:
-            prompt: The input prompt for text generation.
-            model: The model to use for generation.
-            max_tokens: Maximum number of tokens to generate.
-            temperature: Sampling temperature (0.0-1.0).
-
-        Yields:
-            Dictionary containing text chunks and completion status.
-
-        Raises:
-            MCPProtocolError: If there's an issue with the protocol.
-            MCPConnectionError: If connection to the server fails.
-        """
-        if not self.session_id:
-            raise MCPProtocolError("No active session. Call create_session() first.")
-
-        if not prompt.strip():
-            raise MCPProtocolError("Prompt cannot be empty")
-
-        # Validate the request using Pydantic model
-        request = GenerationRequest(
-            prompt=prompt,
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-
-        request_data = build_request_message(
-            type=MCPRequestType.TEXT_GENERATION_STREAM,
-            session_id=self.session_id,
-            input=TextGenerationInput(
-                prompt=request.prompt,
-                max_tokens=request.max_tokens,
-                temperature=request.temperature
-            ),
-            metadata=TextGenerationMetadata(model=request.model)
-        )
-
-        if self.session is None:
-            await self.__aenter__()
-
-        url = f"{self.endpoint}/generate/stream"
-
-        try:
-            async with self.session.post(url, json=request_data) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    self._handle_error_response(response.status, error_text)
-
-                # Process the streaming response
-                async for line in response.content.iter_lines():
-                    if line:
-                        line = line.decode('utf-8')
-                        if line.startswith('data: '):
-                            data = json.loads(line[6:])  # Remove 'data: ' prefix
-                            yield {
-                                "text": data.get("text", ""),
-                                "done": data.get("done", False)
-                            }
-
-        except asyncio.TimeoutError:
-            raise MCPTimeoutError(f"Request timed out after {self.timeout} seconds")
-        except aiohttp.ClientError as e:
-            raise MCPConnectionError(f"Connection error: {str(e)}")
-
-    async def _send_request(
-        self,
-        endpoint_path: str,
-        data: Dict[str, Any],
-        timeout: Optional[float] = None
-    ) -> Dict[str, Any]:
-        """Send a request to the DeepExec service with retry logic.
-
-        Args:
-            endpoint_path: The API endpoint path.
-            data: The request data.
-            timeout: Optional timeout for this specific request.
-
-        Returns:
-            The parsed response data.
-
-        Raises:
-            MCPAuthError: If authentication fails.
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-            MCPProtocolError: If there's an issue with the protocol.
-        """
-        if self.session is None:
-            await self.__aenter__()
-
-        url = f"{self.endpoint}/{endpoint_path}"
-        current_timeout = timeout or self.timeout
-
-        # Add request ID if not present
-        if "request_id" not in data:
-            data["request_id"] = str(uuid.uuid4())
-
-        retries = 0
-        last_error = None
-
-        while retries <= self.max_retries:
-            try:
-                # Set a timeout for this specific request
-                timeout_obj = aiohttp.ClientTimeout(total=current_timeout)
-                
-                async with self.session.post(url, json=data, timeout=timeout_obj) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        return parse_response_message(response_data)
-                    else:
-                        error_text = await response.text()
-                        self._handle_error_response(response.status, error_text)
-
-            except asyncio.TimeoutError:
-                last_error = MCPTimeoutError(f"Request timed out after {current_timeout} seconds")
-            except aiohttp.ClientError as e:
-                last_error = MCPConnectionError(f"Connection error: {str(e)}")
-            except MCPAuthError:
-                # Don't retry auth errors
-                raise
-            except MCPError as e:
-                last_error = e
-
-            # Increment retry counter and delay before retrying
-            retries += 1
-            if retries <= self.max_retries:
-                # Exponential backoff with jitter
-                delay = self.retry_delay * (2 ** (retries - 1)) * (0.5 + 0.5 * (time.time() % 1))
-                await asyncio.sleep(delay)
-
-        # If we've exhausted all retries, raise the last error
-        if last_error:
-            raise last_error
-        else:
-            raise MCPConnectionError("Failed to connect to the server after multiple retries")
-
-    def _handle_error_response(self, status_code: int, error_text: str) -> None:
-        """Handle error responses from the server.
-
-        Args:
-            status_code: The HTTP status code.
-            error_text: The error response text.
-
-        Raises:
-            MCPAuthError: If authentication fails (401, 403).
-            MCPConnectionError: If there's a server error (5xx).
-            MCPProtocolError: For other error responses.
-        """
-        error_data = {}
-        try:
-            error_data = json.loads(error_text)
-        except json.JSONDecodeError:
-            # If not JSON, use the raw text
-            error_message = error_text
-        else:
-            error_message = error_data.get("error", {}).get("message", error_text)
-
-        if status_code == 401 or status_code == 403:
-            raise MCPAuthError(f"Authentication error: {error_message}")
-        elif status_code == 429:
-            raise MCPAuthError(f"Rate limit exceeded: {error_message}")
-        elif 500 <= status_code < 600:
-            raise MCPConnectionError(f"Server error ({status_code}): {error_message}")
-        else:
-            raise MCPProtocolError(f"Protocol error ({status_code}): {error_message}")
-
-    async def _cancel_execution(self, session_id: str) -> None:
-        """Attempt to cancel an ongoing execution.
-
-        Args:
-            session_id: The session ID of the execution to cancel.
-
-        Raises:
-            MCPConnectionError: If connection to the server fails.
-            MCPProtocolError: If there's an issue with the protocol.
-        """
-        if self.session is None:
-            await self.__aenter__()
-
-        request_data = build_request_message(
-            type=MCPRequestType.CANCEL_EXECUTION,
-            session_id=session_id,
-            input={},
-            metadata={}
-        )
-
-        url = f"{self.endpoint}/cancel"
-
-        try:
-            async with self.session.post(url, json=request_data) as response:
-                if response.status != 200:
-                    # Just log the error, don't raise
-                    pass
-        except Exception:
-            # Ignore any errors when canceling
-            pass
-
-    async def close(self) -> None:
-        """Close the client connection."""
-        if self.session:
-            await self.session.close()
-            self.session = None
-            self.session_id = None
-
-    # MCP 操作的高级方法
-    async def submit_mcp_job(
-        self, 
-        name: str, 
-        job_type: str, 
-        data: Dict[str, Any], 
-        timeout: Optional[int] = 60, 
-        priority: Optional[int] = 0,
-        tags: Optional[List[str]] = None
-    ) -> MCPSubmitJobResponse:
-        """Submit a job to the MCP.
-
-        Args:
-            name: The name of the job.
-            job_type: The type of the job.
-            data: The job data.
-            timeout: The job timeout in seconds.
-            priority: The job priority.
-            tags: Optional tags for the job.
-
-        Returns:
-            The job submission response.
-
-        Raises:
-            MCPProtocolError: If job submission fails.
-        """
-        if not self.session_id:
-            await self.create_session()
-
-        request = MCPSubmitJobRequest(
-            name=name,
-            type=job_type,
-            data=data,
-            timeout=timeout,
-            priority=priority,
-            tags=tags or []
-        )
-
-        self.logger.debug("Submitting MCP job: %s (type: %s)", name, job_type)
-
-        response = await self._send_request(
-            "jobs",
-            request
-        )
-
-        return MCPSubmitJobResponse(**response)
-
-    async def get_mcp_job_status(self, job_id: str) -> MCPJobStatusResponse:
-        """Get the status of an MCP job.
-
-        Args:
-            job_id: The ID of the job.
-
-        Returns:
-            The job status response.
-
-        Raises:
-            MCPProtocolError: If status retrieval fails.
-        """
-        if not self.session_id:
-            await self.create_session()
-
-        request = MCPJobStatusRequest(job_id=job_id)
-
-        self.logger.debug("Getting status for MCP job: %s", job_id)
-
-        response = await self._send_request(
-            f"jobs/{job_id}/status",
-            request
-        )
-
-        return MCPJobStatusResponse(**response)
-
-    async def cancel_mcp_job(self, job_id: str, reason: Optional[str] = None) -> MCPCancelJobResponse:
-        """Cancel an MCP job.
-
-        Args:
-            job_id: The ID of the job to cancel.
-            reason: Optional reason for cancellation.
-
-        Returns:
-            The job cancellation response.
-
-        Raises:
-            MCPProtocolError: If job cancellation fails.
-        """
-        if not self.session_id:
-            await self.create_session()
-
-        request = MCPCancelJobRequest(
-            job_id=job_id,
-            reason=reason
-        )
-
-        self.logger.debug("Cancelling MCP job: %s (reason: %s)", job_id, reason or "Not specified")
-
-        response = await self._send_request(
-            f"jobs/{job_id}/cancel",
-            request
-        )
-
-        return MCPCancelJobResponse(**response)
-
-    async def wait_for_mcp_job_completion(
-        self, 
-        job_id: str, 
-        poll_interval: float = 1.0, 
-        max_wait_time: Optional[float] = None
-    ) -> MCPJobStatusResponse:
-        """Wait for an MCP job to complete.
-
-        Args:
-            job_id: The ID of the job to wait for.
-            poll_interval: The interval between status checks in seconds.
-            max_wait_time: The maximum time to wait in seconds. If None, wait indefinitely.
-
-        Returns:
-            The final job status response.
-
-        Raises:
-            MCPTimeoutError: If the job does not complete within the specified time.
-            MCPProtocolError: If status retrieval fails.
-        """
-        start_time = time.time()
-        self.logger.debug("Waiting for MCP job completion: %s", job_id)
-
-        while True:
-            status_response = await self.get_mcp_job_status(job_id)
-            
-            if status_response.status in [MCPJobStatus.COMPLETED, MCPJobStatus.FAILED, MCPJobStatus.CANCELED]:
-                self.logger.debug("MCP job %s completed with status: %s", job_id, status_response.status)
-                return status_response
-            
-            if max_wait_time and (time.time() - start_time) > max_wait_time:
-                raise MCPTimeoutError(f"Job {job_id} did not complete within the specified time")
-            
-            await asyncio.sleep(poll_interval)
-
-    # 更新现有方法以使用新的 MCP 高级方法
-    async def submit_job(
-        self, 
-        name: str, 
-        job_type: str, 
-        data: Dict[str, Any], 
-        timeout: Optional[int] = 60,
-        priority: Optional[int] = 0,
-        tags: Optional[List[str]] = None) -> MCPSubmitJobResponse:
-        """Submit a job to the MCP service.
-        
-        Args:
-            name: Name of the job.
-            job_type: Type of the job (e.g., "code_execution", "text_generation").
-            data: Job data, structure depends on the job type.
-            timeout: Timeout for the job in seconds.
-            priority: Priority of the job (higher values mean higher priority).
-            tags: Optional tags for the job.
-            
-        Returns:
-            MCPSubmitJobResponse object containing job details.
-            
-        Raises:
-            MCPAuthError: If authentication fails.
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-            MCPProtocolError: If there's an issue with the protocol.
-        """
-        return await self.submit_mcp_job(
-            name=name,
-            job_type=job_type,
-            data=data,
-            timeout=timeout,
-            priority=priority,
-            tags=tags
-        )
-
-    async def get_job_status(self, job_id: str) -> MCPJobStatusResponse:
-        """Get the status of a job.
-        
-        Args:
-            job_id: ID of the job to check.
-            
-        Returns:
-            MCPJobStatusResponse object containing job status details.
-            
-        Raises:
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-            MCPProtocolError: If there's an issue with the protocol.
-        """
-        return await self.get_mcp_job_status(job_id)
-
-    async def cancel_job(self, job_id: str, reason: Optional[str] = None) -> MCPCancelJobResponse:
-        """Cancel a job.
-        
-        Args:
-            job_id: ID of the job to cancel.
-            reason: Optional reason for cancellation.
-            
-        Returns:
-            MCPCancelJobResponse object containing cancellation details.
-            
-        Raises:
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-            MCPProtocolError: If there's an issue with the protocol.
-        """
-        return await self.cancel_mcp_job(job_id, reason)
-
-    async def execute_code_job(self, 
-                             code: str, 
-                             language: str,
-                             environment: Optional[Dict[str, str]] = None,
-                             working_directory: Optional[str] = None,
-                             timeout: Optional[int] = 30) -> MCPSubmitJobResponse:
-        """Submit a code execution job.
-        
-        Args:
-            code: The code to execute.
-            language: The programming language of the code.
-            environment: Optional environment variables for the execution.
-            working_directory: Optional working directory for the execution.
-            timeout: Optional timeout for this specific execution in seconds.
-            
-        Returns:
-            MCPSubmitJobResponse object containing job details.
-            
-        Raises:
-            MCPAuthError: If authentication fails.
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-            MCPProtocolError: If there's an issue with the protocol.
-        """
-        # Create and validate the code execution request
-        code_request = MCPCodeExecutionRequest(
-            code=code,
-            language=language,
-            environment=environment or {},
-            working_directory=working_directory or "/home/user",
-            timeout=timeout
-        )
-        
-        # Submit the job
-        return await self.submit_mcp_job(
-            name=f"code_execution_{language}_{int(time.time())}",
-            job_type="code_execution",
-            data=code_request.dict(),
-            timeout=timeout
-        )
-    
-    async def get_code_execution_result(self, job_id: str) -> MCPCodeExecutionResult:
-        """Get the result of a code execution job.
-        
-        Args:
-            job_id: ID of the code execution job.
-            
-        Returns:
-            MCPCodeExecutionResult object containing execution results.
-            
-        Raises:
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-            MCPProtocolError: If there's an issue with the protocol.
-            MCPExecutionError: If the execution failed or is not complete.
-        """
-        # Get job status
-        status_response = await self.get_mcp_job_status(job_id)
-        
-        # Check if job is completed
-        if status_response.status != MCPJobStatus.COMPLETED:
-            if status_response.status == MCPJobStatus.FAILED:
-                error_details = status_response.error or {"message": "Unknown error"}
-                raise MCPExecutionError(f"Code execution failed: {error_details.get('message')}")
-            else:
-                raise MCPExecutionError(f"Code execution is not complete. Current status: {status_response.status}")
-        
-        # Extract result
-        result = status_response.result
-        if not result:
-            raise MCPProtocolError("No result data in completed job")
-        
-        # Parse and return the execution result
-        return MCPCodeExecutionResult(
-            output=result.get("output", ""),
-            exit_code=result.get("exit_code", 1),
-            execution_time=result.get("execution_time", 0),
-            memory_usage=result.get("memory_usage", 0),
-            metadata=result.get("metadata", {})
-        )
-    
-    async def execute_code_and_wait(self, 
-                                  code: str, 
-                                  language: str,
-                                  environment: Optional[Dict[str, str]] = None,
-                                  working_directory: Optional[str] = None,
-                                  timeout: Optional[int] = 30,
-                                  poll_interval: float = 0.5) -> MCPCodeExecutionResult:
-        """Execute code and wait for the result.
-        
-        This is a convenience method that submits a code execution job,
-        polls for its completion, and returns the result.
-        
-        Args:
-            code: The code to execute.
-            language: The programming language of the code.
-            environment: Optional environment variables for the execution.
-            working_directory: Optional working directory for the execution.
-            timeout: Optional timeout for this specific execution in seconds.
-            poll_interval: Interval between status checks in seconds.
-            
-        Returns:
-            MCPCodeExecutionResult object containing execution results.
-            
-        Raises:
-            MCPAuthError: If authentication fails.
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the execution times out.
-            MCPProtocolError: If there's an issue with the protocol.
-            MCPExecutionError: If code execution fails.
-        """
-        # Submit the code execution job
-        job_response = await self.execute_code_job(
-            code=code,
-            language=language,
-            environment=environment,
-            working_directory=working_directory,
-            timeout=timeout
-        )
-        
-        job_id = job_response.job_id
-        start_time = time.time()
-        max_wait_time = timeout or 30
-        
-        # Poll for job completion
-        while time.time() - start_time < max_wait_time:
-            try:
-                # Try to get the result
-                return await self.get_code_execution_result(job_id)
-            except MCPExecutionError as e:
-                # If job failed, re-raise the exception
-                if "failed" in str(e):
-                    raise
-                # If job is still running, wait and retry
-                await asyncio.sleep(poll_interval)
-        
-        # If we get here, the job timed out
-        try:
-            # Try to cancel the job
-            await self.cancel_job(job_id, reason="Client timeout")
-        except Exception:
-            # Ignore errors when canceling
-            pass
-        
-        raise MCPTimeoutError(f"Code execution timed out after {max_wait_time} seconds")
-    
-    async def generate_text_job(self,
-                              prompt: str,
-                              model: str = "deepseek-v3",
-                              max_tokens: int = 1000,
-                              temperature: float = 0.7,
-                              timeout: Optional[int] = 60) -> MCPSubmitJobResponse:
-        """Submit a text generation job.
-        
-        Args:
-            prompt: The input prompt for text generation.
-            model: The model to use for generation.
-            max_tokens: Maximum number of tokens to generate.
-            temperature: Sampling temperature (0.0-1.0).
-            timeout: Optional timeout for this specific generation in seconds.
-            
-        Returns:
-            MCPSubmitJobResponse object containing job details.
-            
-        Raises:
-            MCPAuthError: If authentication fails.
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-            MCPProtocolError: If there's an issue with the protocol.
-        """
-        # Create and validate the text generation request
-        text_request = MCPTextGenerationRequest(
-            prompt=prompt,
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-        
-        # Submit the job
-        return await self.submit_mcp_job(
-            name=f"text_generation_{model}_{int(time.time())}",
-            job_type="text_generation",
-            data=text_request.dict(),
-            timeout=timeout
-        )
-    
-    async def get_text_generation_result(self, job_id: str) -> MCPTextGenerationResult:
-        """Get the result of a text generation job.
-        
-        Args:
-            job_id: ID of the text generation job.
-            
-        Returns:
-            MCPTextGenerationResult object containing generation results.
-            
-        Raises:
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the request times out.
-            MCPProtocolError: If there's an issue with the protocol.
-            MCPExecutionError: If the generation failed or is not complete.
-        """
-        # Get job status
-        status_response = await self.get_mcp_job_status(job_id)
-        
-        # Check if job is completed
-        if status_response.status != MCPJobStatus.COMPLETED:
-            if status_response.status == MCPJobStatus.FAILED:
-                error_details = status_response.error or {"message": "Unknown error"}
-                raise MCPExecutionError(f"Text generation failed: {error_details.get('message')}")
-            else:
-                raise MCPExecutionError(f"Text generation is not complete. Current status: {status_response.status}")
-        
-        # Extract result
-        result = status_response.result
-        if not result:
-            raise MCPProtocolError("No result data in completed job")
-        
-        # Parse and return the generation result
-        return MCPTextGenerationResult(
-            text=result.get("text", ""),
-            model=result.get("model", "unknown"),
-            generation_time=result.get("generation_time", 0),
-            usage=result.get("usage", {})
-        )
-    
-    async def generate_text_and_wait(self,
-                                   prompt: str,
-                                   model: str = "deepseek-v3",
-                                   max_tokens: int = 1000,
-                                   temperature: float = 0.7,
-                                   timeout: Optional[int] = 60,
-                                   poll_interval: float = 0.5) -> MCPTextGenerationResult:
-        """Generate text and wait for the result.
-        
-        This is a convenience method that submits a text generation job,
-        polls for its completion, and returns the result.
-        
-        Args:
-            prompt: The input prompt for text generation.
-            model: The model to use for generation.
-            max_tokens: Maximum number of tokens to generate.
-            temperature: Sampling temperature (0.0-1.0).
-            timeout: Optional timeout for this specific generation in seconds.
-            poll_interval: Interval between status checks in seconds.
-            
-        Returns:
-            MCPTextGenerationResult object containing generation results.
-            
-        Raises:
-            MCPAuthError: If authentication fails.
-            MCPConnectionError: If connection to the server fails.
-            MCPTimeoutError: If the generation times out.
-            MCPProtocolError: If there's an issue with the protocol.
-            MCPExecutionError: If text generation fails.
-        """
-        # Submit the text generation job
-        job_response = await self.generate_text_job(
-            prompt=prompt,
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            timeout=timeout
-        )
-        
-        job_id = job_response.job_id
-        start_time = time.time()
-        max_wait_time = timeout or 60
-        
-        # Poll for job completion
-        while time.time() - start_time < max_wait_time:
-            try:
-                # Try to get the result
-                return await self.get_text_generation_result(job_id)
-            except MCPExecutionError as e:
-                # If job failed, re-raise the exception
-                if "failed" in str(e):
-                    raise
-                # If job is still running, wait and retry
-                await asyncio.sleep(poll_interval)
-        
-        # If we get here, the job timed out
-        try:
-            # Try to cancel the job
-            await self.cancel_job(job_id, reason="Client timeout")
-        except Exception:
-            # Ignore errors when canceling
-            pass
-        
-        raise MCPTimeoutError(f"Text generation timed out after {max_wait_time} seconds")
-    
-    async def execute_code(self,
-                         code: str,
-                         language: str,
-                         environment: Optional[Dict[str, str]] = None,
-                         working_directory: Optional[str] = None,
-                         timeout: Optional[float] = None) -> ExecutionResult:
-        """Execute code asynchronously.
-
-        Args:
-            code: The code to execute.
-            language: The programming language of the code.
-            environment: Optional environment variables for the execution.
-            working_directory: Optional working directory for the execution.
-            timeout: Optional timeout for this specific execution.
-
-        Returns:
-            ExecutionResult object containing the execution results.
-
-        Raises:
-            MCPProtocolError: If there's an issue with the protocol.
-            MCPExecutionError: If code execution fails.
-            MCPTimeoutError: If the execution times out.
-            MCPConnectionError: If connection to the server fails.
-        """
-        # 使用新的实现
-        try:
-            result = await self.execute_code_and_wait(
-                code=code,
-                language=language,
-                environment=environment,
-                working_directory=working_directory,
-                timeout=int(timeout) if timeout else 30
-            )
-            
-            # 转换为旧的结果格式
-            return ExecutionResult(
-                output=result.output,
-                exit_code=result.exit_code,
-                execution_time=result.execution_time,
-                memory_usage=result.memory_usage,
-                metadata=result.metadata
-            )
-        except Exception as e:
-            # 保持原有的异常处理逻辑
-            if isinstance(e, MCPTimeoutError):
-                # 尝试取消执行
-                if hasattr(e, "job_id") and getattr(e, "job_id"):
-                    try:
-                        await self.cancel_job(getattr(e, "job_id"), reason="Client timeout")
-                    except Exception:
-                        # 忽略取消时的错误
-                        pass
-            raise
+import asyncio
+import os
+import aiohttp
+import time
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, AsyncGenerator, List, Union
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional HTTP/2 transport
+    httpx = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional event loop speedup
+    uvloop = None
+
+from pydantic import TypeAdapter
+
+from ._json import loads as _json_loads
+from .exceptions import (
+    MCPError, MCPAuthError, MCPConnectionError, 
+    MCPTimeoutError, MCPProtocolError, MCPExecutionError
+)
+from .models import (
+    ExecutionResult, GenerationResult, 
+    StreamGenerationChunk, TokenUsage,
+    MCPSubmitJobRequest, MCPSubmitJobResponse,
+    MCPJobStatusRequest, MCPJobStatusResponse,
+    MCPCancelJobRequest, MCPCancelJobResponse,
+    MCPCodeExecutionRequest, MCPCodeExecutionResult,
+    MCPTextGenerationRequest, MCPTextGenerationResult,
+    MCPStreamGenerationChunk, MCPJobStatus,
+    TERMINAL_JOB_STATES
+)
+from .protocols.mcp import (
+    build_request_message, parse_response_message, decode_stream_chunk,
+    encode_request_payload, decode_response_body, MSGPACK_AVAILABLE,
+    MCPRequestType, MCPResponseType,
+    CreateSessionInput, CodeExecutionInput, TextGenerationInput,
+    TextGenerationMetadata
+)
+
+# Shared validator for job-status stream frames: built once at import time so
+# every frame reuses the same pydantic-core SchemaValidator.
+_JOB_STATUS_FRAME_ADAPTER = TypeAdapter(MCPJobStatusResponse)
+
+
+# Upper bound for one buffered SSE line; a frame this large means the
+# stream is corrupt, not a token chunk
+_MAX_SSE_LINE = 1 << 20
+
+
+class _RateLimiter:
+    """Proactive sliding-window request limiter.
+
+    The admission controller reacts to 429s; this limiter tries not to earn
+    them in the first place. A deque of monotonic timestamps tracks requests
+    in the last 60s and callers sleep before sending once the window is
+    full, and provider rate-limit headers can impose an explicit pause, so
+    round trips are not wasted on calls the server would reject.
+    """
+    __slots__ = ("rpm_limit", "_stamps", "_pause_until")
+
+    def __init__(self, rpm_limit: int = 300):
+        self.rpm_limit = rpm_limit
+        self._stamps = deque()
+        self._pause_until = 0.0
+
+    async def wait_if_throttled(self) -> None:
+        now = time.monotonic()
+        if self._pause_until > now:
+            await asyncio.sleep(self._pause_until - now)
+            now = time.monotonic()
+        stamps = self._stamps
+        while stamps and now - stamps[0] >= 60.0:
+            stamps.popleft()
+        if len(stamps) >= self.rpm_limit:
+            wait = stamps[0] + 60.0 - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            stamps.popleft()
+        stamps.append(time.monotonic())
+
+    def update_from_headers(self, headers) -> None:
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                self._pause_until = time.monotonic() + float(retry_after)
+            except ValueError:
+                pass
+            return
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        limit = headers.get("x-ratelimit-limit-requests")
+        if remaining is not None and limit is not None:
+            try:
+                # Nearly exhausted: back off briefly before the hard limit
+                if int(remaining) < int(limit) * 0.1:
+                    self._pause_until = time.monotonic() + 1.0
+            except ValueError:
+                pass
+
+
+class _AdmissionController:
+    """AIMD governor for the number of in-flight requests.
+
+    Retries alone make congestion worse: when the backend slows down or
+    starts returning 429s, every caller re-sends on its own schedule. This
+    controller caps concurrency with a semaphore and adapts the cap the way
+    TCP does — additive increase on success, multiplicative decrease on
+    throttling — so the client converges on a safe in-flight count instead
+    of hammering a struggling server.
+    """
+    __slots__ = ("limit", "min_limit", "max_limit", "_permits", "_debt", "_sem")
+
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 64):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._permits = initial
+        self._debt = 0  # permits to absorb instead of returning on release
+        self._sem = asyncio.Semaphore(initial)
+
+    async def acquire(self) -> None:
+        await self._sem.acquire()
+
+    def release(self) -> None:
+        if self._debt > 0:
+            self._debt -= 1
+        else:
+            self._sem.release()
+
+    def on_success(self) -> None:
+        """Additive increase: grow the window slowly while things are healthy."""
+        if self.limit < self.max_limit:
+            self.limit += 0.125
+            if int(self.limit) > self._permits:
+                self._permits += 1
+                self.release()
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease: halve the window on 429/load shedding."""
+        new_limit = max(self.min_limit, int(self.limit / 2))
+        shrink = self._permits - new_limit
+        if shrink > 0:
+            self._debt += shrink
+            self._permits = new_limit
+        self.limit = float(new_limit)
+
+
+class DeepExecAsyncClient:
+    """Asynchronous client for interacting with the DeepExec service."""
+
+    # Optional process-wide session installed via set_shared_session()
+    _shared_session: Optional[aiohttp.ClientSession] = None
+
+    def __init__(
+        self,
+        endpoint: str = "https://api.deepexec.com/v1",
+        deepseek_key: Optional[str] = None,
+        e2b_key: Optional[str] = None,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        verify_ssl: bool = True,
+        batch_window: Optional[float] = None,
+        max_batch: int = 16,
+        use_msgpack: bool = False,
+    ):
+        """Initialize the asynchronous DeepExec client.
+
+        Args:
+            endpoint: The API endpoint URL.
+            deepseek_key: The DeepSeek API key for authentication.
+            e2b_key: The E2B API key for code execution.
+            timeout: Request timeout in seconds.
+            max_retries: Maximum number of retry attempts for failed requests.
+            retry_delay: Base delay between retries in seconds.
+            verify_ssl: Whether to verify SSL certificates.
+        """
+        self.endpoint = endpoint
+        self.deepseek_key = deepseek_key
+        self.e2b_key = e2b_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.verify_ssl = verify_ssl
+        
+        self.session = None
+        self.session_id = None
+        # Guards lazy session creation: concurrent first calls previously
+        # raced to build two sessions and leaked one
+        self._session_lock = asyncio.Lock()
+        self._owns_session = True
+        self._request_headers = None
+        # AIMD admission control over concurrent requests
+        self._admission = _AdmissionController()
+        # Sliding-window limiter that pauses before the provider would 429
+        self._rate_limiter = _RateLimiter()
+        # ClientTimeout is immutable, so one instance per distinct value is
+        # enough; the default is prebuilt here and reused on every request
+        self._timeout_cache: Dict[float, aiohttp.ClientTimeout] = {
+            timeout: aiohttp.ClientTimeout(total=timeout)
+        }
+        # Optional HTTP/2 transport: multiplexes concurrent requests over one
+        # TLS connection. Opt-in via DEEPEXEC_HTTP2=1 when httpx is
+        # installed; streaming endpoints stay on aiohttp either way.
+        self._http2_client = None
+        self._use_http2 = httpx is not None and os.environ.get("DEEPEXEC_HTTP2") == "1"
+        # Opt-in request coalescing: when batch_window is set, generate_text
+        # calls queue up and a background worker posts them as one /batch
+        # request, amortizing RTT and framing across concurrent callers
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._gen_queue = None
+        self._batch_task = None
+        # Opt-in binary responses: advertise MessagePack in Accept and let
+        # decode_response_body branch on what the server actually sent.
+        # Requests stay JSON, so there is nothing to negotiate upfront.
+        self._use_msgpack = use_msgpack and MSGPACK_AVAILABLE
+        self._headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/msgpack, application/json" if self._use_msgpack else "application/json"
+        }
+        
+        if deepseek_key:
+            self._headers["X-DeepSeek-Key"] = deepseek_key
+        if e2b_key:
+            self._headers["X-E2B-Key"] = e2b_key
+            
+        # 初始化日志记录器
+        self.logger = logging.getLogger("deepexec.async_client")
+        self.logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        handler.setLevel(logging.DEBUG)
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        self.logger.addHandler(handler)
+
+    @classmethod
+    def set_shared_session(cls, session: Optional[aiohttp.ClientSession]) -> None:
+        """Install a process-wide ClientSession shared by all clients.
+
+        Apps that build many clients (one per tenant, say) otherwise pay
+        for one connection pool each. A single long-lived session shares
+        the DNS cache, TLS session resumption and a bounded FD budget;
+        create it once with a generously sized TCPConnector, e.g.
+        TCPConnector(limit=512, limit_per_host=64, keepalive_timeout=75),
+        and keep it open for the process lifetime. Clients never close a
+        shared session; pass None to go back to per-client sessions.
+
+        Args:
+            session: The session to share, or None to disable sharing.
+        """
+        cls._shared_session = session
+
+    @classmethod
+    def install_uvloop(cls) -> bool:
+        """Install uvloop as the asyncio event loop policy if available.
+
+        The client is purely I/O-bound, where libuv's C event loop gives
+        the largest wins. Call once before asyncio.run(); on Python 3.12+
+        asyncio.Runner(loop_factory=uvloop.new_event_loop) is an
+        alternative that avoids the global policy.
+
+        Returns:
+            True if uvloop was installed, False if it is not available
+            (not installed, or an unsupported platform such as Windows).
+        """
+        if uvloop is None:
+            return False
+        uvloop.install()
+        return True
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self._ensure_session()
+        return self
+
+    async def _ensure_session(self) -> None:
+        """Create the underlying HTTP session exactly once.
+
+        Double-checked under the session lock so concurrent first calls on
+        a fresh client cannot race and leak a second connector.
+        """
+        if self.session is None:
+            async with self._session_lock:
+                if self.session is None:
+                    shared = type(self)._shared_session
+                    if shared is not None and not shared.closed:
+                        # Borrow the process-wide session: auth headers are
+                        # applied per request since the pool is shared
+                        self.session = shared
+                        self._owns_session = False
+                        self._request_headers = self._headers
+                        if self._batch_window and self._batch_task is None:
+                            self._gen_queue = asyncio.Queue()
+                            self._batch_task = asyncio.create_task(self._batch_worker())
+                        return
+                    # One tuned connector for the client lifetime: keep-alive
+                    # connections skip the TCP+TLS handshake per request and
+                    # the DNS cache removes repeated getaddrinfo calls
+                    connector = aiohttp.TCPConnector(
+                        limit=256,
+                        limit_per_host=64,
+                        keepalive_timeout=75,
+                        ttl_dns_cache=300,
+                        ssl=self.verify_ssl,
+                    )
+                    self.session = aiohttp.ClientSession(
+                        headers=self._headers,
+                        timeout=aiohttp.ClientTimeout(total=self.timeout),
+                        connector=connector,
+                    )
+                    if self._use_http2 and self._http2_client is None:
+                        self._http2_client = httpx.AsyncClient(
+                            http2=True,
+                            headers=self._headers,
+                            timeout=self.timeout,
+                            limits=httpx.Limits(
+                                max_keepalive_connections=32,
+                                keepalive_expiry=75,
+                            ),
+                        )
+                    if self._batch_window and self._batch_task is None:
+                        self._gen_queue = asyncio.Queue()
+                        self._batch_task = asyncio.create_task(self._batch_worker())
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    async def create_session(self, user_id: str) -> str:
+        """Create a new session with the DeepExec service.
+
+        Args:
+            user_id: Identifier for the user creating the session.
+
+        Returns:
+            The session ID.
+
+        Raises:
+            MCPAuthError: If authentication fails.
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+        """
+        if not self.deepseek_key or not self.e2b_key:
+            raise MCPAuthError("Both DeepSeek and E2B API keys are required")
+
+        await self._ensure_session()
+
+        request_data = build_request_message(
+            type=MCPRequestType.CREATE_SESSION,
+            session_id=None,  # No session ID yet
+            input=CreateSessionInput(user_id=user_id),
+            metadata={}
+        )
+
+        self.logger.debug("Creating new session with user ID %s", user_id)
+
+        response = await self._send_request(
+            "sessions",
+            request_data
+        )
+
+        self.session_id = response.get("session_id")
+        if not self.session_id:
+            raise MCPProtocolError("Failed to create session: No session ID returned")
+
+        self.logger.debug("Created new session with ID %s", self.session_id)
+
+        return self.session_id
+
+    async def execute_code(
+        self,
+        code: str,
+        language: str,
+        environment: Optional[Dict[str, str]] = None,
+        working_directory: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> ExecutionResult:
+        """Execute code asynchronously.
+
+        Args:
+            code: The code to execute.
+            language: The programming language of the code.
+            environment: Optional environment variables for the execution.
+            working_directory: Optional working directory for the execution.
+            timeout: Optional timeout for this specific execution.
+
+        Returns:
+            ExecutionResult object containing the execution results.
+
+        Raises:
+            MCPProtocolError: If there's an issue with the protocol.
+            MCPExecutionError: If code execution fails.
+            MCPTimeoutError: If the execution times out.
+            MCPConnectionError: If connection to the server fails.
+        """
+        if not self.session_id:
+            raise MCPProtocolError("No active session. Call create_session() first.")
+
+        if not code or code.isspace():
+            raise MCPProtocolError("Code cannot be empty")
+
+        # Validate once, directly into the protocol input model; the old
+        # ExecutionRequest round trip ran the same validators twice and
+        # allocated an extra model per call
+        request_data = build_request_message(
+            type=MCPRequestType.CODE_EXECUTION,
+            session_id=self.session_id,
+            input=CodeExecutionInput(
+                code=code,
+                language=language,
+                environment=environment or {},
+                working_directory=working_directory or "/home/user"
+            ),
+            metadata={}
+        )
+
+        # Use the provided timeout if specified, otherwise use the client's default
+        current_timeout = timeout or self.timeout
+
+        self.logger.debug("Executing code with language %s and timeout %s", language, current_timeout)
+
+        try:
+            response = await self._send_request(
+                "execute",
+                request_data,
+                timeout=current_timeout
+            )
+
+            # Parse the execution result
+            result = ExecutionResult(
+                output=response.get("output", ""),
+                exit_code=response.get("exitCode", 1),
+                execution_time=response.get("executionTime", 0),
+                memory_usage=response.get("memoryUsage", 0),
+                metadata=response.get("metadata", {})
+            )
+            return result
+
+        except MCPTimeoutError:
+            # Attempt to cancel the execution if it timed out
+            if self.session_id:
+                try:
+                    await self._cancel_execution(self.session_id)
+                except Exception:
+                    # Ignore errors when canceling, as we're already handling a timeout
+                    pass
+            raise
+
+    async def execute_many(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 16
+    ) -> List[ExecutionResult]:
+        """Execute several code snippets with bounded concurrency.
+
+        Prefer this over an unbounded ``asyncio.gather`` of execute_code
+        calls: the semaphore keeps at most ``concurrency`` requests in
+        flight, so the connection pool is reused instead of exhausted and
+        memory stays flat regardless of how many items are queued.
+
+        Args:
+            items: Keyword-argument dicts, one per execute_code call.
+            concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+            ExecutionResult objects in the same order as items.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(item: Dict[str, Any]) -> ExecutionResult:
+            async with semaphore:
+                return await self.execute_code(**item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+    async def generate_text(
+        self,
+        prompt: str,
+        model: str = "deepseek-v3",
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
+    ) -> GenerationResult:
+        """Generate text asynchronously using the DeepSeek model.
+
+        Args:
+            prompt: The input prompt for text generation.
+            model: The model to use for generation.
+            max_tokens: Maximum number of tokens to generate.
+            temperature: Sampling temperature (0.0-1.0).
+            timeout: Optional timeout for this specific generation.
+
+        Returns:
+            GenerationResult object containing the generated text and metadata.
+
+        Raises:
+            MCPProtocolError: If there's an issue with the protocol.
+            MCPTimeoutError: If the generation times out.
+            MCPConnectionError: If connection to the server fails.
+        """
+        if not self.session_id:
+            raise MCPProtocolError("No active session. Call create_session() first.")
+
+        if not prompt or prompt.isspace():
+            raise MCPProtocolError("Prompt cannot be empty")
+
+        # Validate the request using Pydantic model
+        request_data = build_request_message(
+            type=MCPRequestType.TEXT_GENERATION,
+            session_id=self.session_id,
+            input=TextGenerationInput(
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ),
+            metadata=TextGenerationMetadata(model=model)
+        )
+
+        # Use the provided timeout if specified, otherwise use the client's default
+        current_timeout = timeout or self.timeout
+
+        self.logger.debug("Generating text with model %s and timeout %s", model, current_timeout)
+
+        if self._batch_task is not None:
+            fut = asyncio.get_running_loop().create_future()
+            await self._gen_queue.put((request_data, fut))
+            response = await fut
+        else:
+            response = await self._send_request(
+                "generate",
+                request_data,
+                timeout=current_timeout
+            )
+
+        # Parse the generation result
+        result = GenerationResult(
+            text=response.get("text", ""),
+            model=response.get("model", model),
+            generation_time=response.get("generationTime", 0),
+            usage=response.get("usage", {
+                "promptTokens": 0,
+                "completionTokens": 0,
+                "totalTokens": 0
+            })
+        )
+        return result
+
+    async def generate_many(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 16
+    ) -> List[GenerationResult]:
+        """Generate text for several prompts with bounded concurrency.
+
+        Args:
+            items: Keyword-argument dicts, one per generate_text call.
+            concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+            GenerationResult objects in the same order as items.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(item: Dict[str, Any]) -> GenerationResult:
+            async with semaphore:
+                return await self.generate_text(**item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+    async def stream_generate_text(
+        self,
+        prompt: str,
+        model: str = "deepseek-v3",
+        max_tokens: int = 1000,
+        temperature: float = 0.7
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Generate text with streaming response.
+
+        Args:
+            prompt: The input prompt for text generation.
+            model: The model to use for generation.
+            max_tokens: Maximum number of tokens to generate.
+            temperature: Sampling temperature (0.0-1.0).
+
+        Yields:
+            Dictionary containing text chunks and completion status.
+
+        Raises:
+            MCPProtocolError: If there's an issue with the protocol.
+            MCPConnectionError: If connection to the server fails.
+        """
+        if not self.session_id:
+            raise MCPProtocolError("No active session. Call create_session() first.")
+
+        if not prompt or prompt.isspace():
+            raise MCPProtocolError("Prompt cannot be empty")
+
+        # Validate the request using Pydantic model
+        request_data = build_request_message(
+            type=MCPRequestType.TEXT_GENERATION_STREAM,
+            session_id=self.session_id,
+            input=TextGenerationInput(
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ),
+            metadata=TextGenerationMetadata(model=model)
+        )
+
+        await self._ensure_session()
+
+        url = f"{self.endpoint}/generate/stream"
+
+        try:
+            async with self.session.post(url, data=encode_request_payload(request_data), headers=self._request_headers) as response:
+                if response.status != 200:
+                    self._handle_error_response(response.status, await response.read())
+
+                # Process the streaming response with a byte-level line
+                # splitter: frames never leave bytes until the JSON decode,
+                # and iter_any avoids readline's per-call buffering
+                buf = bytearray()
+                async for data in response.content.iter_any():
+                    buf += data
+                    while True:
+                        nl = buf.find(b"\n")
+                        if nl == -1:
+                            break
+                        line = bytes(buf[:nl])
+                        del buf[:nl + 1]
+                        if line.startswith(b'data: '):
+                            yield decode_stream_chunk(line[6:])  # Remove 'data: ' prefix
+                    if len(buf) > _MAX_SSE_LINE:
+                        raise MCPProtocolError("SSE frame exceeds maximum line length")
+
+        except asyncio.TimeoutError:
+            raise MCPTimeoutError(f"Request timed out after {self.timeout} seconds")
+        except aiohttp.ClientError as e:
+            raise MCPConnectionError(f"Connection error: {str(e)}")
+
+
+    async def _batch_worker(self) -> None:
+        """Coalesce queued generation requests into single batch posts.
+
+        Waits for the first queued item, then drains up to max_batch more
+        within the batch window before posting them as one request, so the
+        window bounds added latency while bursts share a single round trip.
+        """
+        while True:
+            item = await self._gen_queue.get()
+            items = [item]
+            try:
+                deadline = time.monotonic() + self._batch_window
+                while len(items) < self._max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(self._gen_queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+                response = await self._send_request(
+                    "generate/batch",
+                    {"requests": [request_data for request_data, _ in items]}
+                )
+                results = response.get("results", [])
+                for (_, fut), result in zip(items, results):
+                    if fut.done():
+                        continue
+                    # Each batch entry is a wire frame; run it through the
+                    # same parsing as the direct path so callers see the
+                    # client shape, and error frames raise per item
+                    try:
+                        fut.set_result(parse_response_message(result))
+                    except Exception as e:
+                        fut.set_exception(e)
+                for _, fut in items[len(results):]:
+                    if not fut.done():
+                        fut.set_exception(MCPProtocolError("Batch response missing results"))
+            except asyncio.CancelledError:
+                # The worker is cancelled by close(); fail the in-flight
+                # batch so no caller is left awaiting a dead future
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(MCPConnectionError("Client closed"))
+                raise
+            except Exception as e:
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+
+    async def _send_request(
+        self,
+        endpoint_path: str,
+        data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send a request to the DeepExec service with retry logic.
+
+        Args:
+            endpoint_path: The API endpoint path.
+            data: The request data.
+            timeout: Optional timeout for this specific request.
+
+        Returns:
+            The parsed response data.
+
+        Raises:
+            MCPAuthError: If authentication fails.
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+            MCPProtocolError: If there's an issue with the protocol.
+        """
+        await self._ensure_session()
+
+        url = f"{self.endpoint}/{endpoint_path}"
+        current_timeout = timeout or self.timeout
+
+        # Add request ID if not present. os.urandom(16).hex() gives the same
+        # 128 bits of entropy as uuid4 without the UUID object, version-byte
+        # munging, or hyphen formatting; on Linux it is a lock-free getrandom
+        if "request_id" not in data:
+            data["request_id"] = os.urandom(16).hex()
+
+        # Encode once, outside the retry loop. encode_request_payload splices
+        # the pre-serialized protocol header and knows how to serialize the
+        # pydantic input models embedded in the envelope
+        payload = encode_request_payload(data)
+
+        timeout_obj = self._timeout_cache.get(current_timeout)
+        if timeout_obj is None:
+            timeout_obj = self._timeout_cache.setdefault(
+                current_timeout, aiohttp.ClientTimeout(total=current_timeout)
+            )
+
+        retries = 0
+        last_error = None
+
+        while retries <= self.max_retries:
+            retry_after = None
+            try:
+                await self._rate_limiter.wait_if_throttled()
+                await self._admission.acquire()
+                try:
+                    if self._http2_client is not None:
+                        try:
+                            h2_response = await self._http2_client.post(
+                                url, content=payload, timeout=current_timeout
+                            )
+                        except httpx.TimeoutException:
+                            raise asyncio.TimeoutError()
+                        except httpx.HTTPError as e:
+                            raise MCPConnectionError(f"Connection error: {str(e)}")
+                        self._rate_limiter.update_from_headers(h2_response.headers)
+                        if h2_response.status_code == 200:
+                            raw = h2_response.content
+                            self._admission.on_success()
+                            return decode_response_body(
+                                raw,
+                                h2_response.headers.get("content-type", "").split(";")[0],
+                            )
+                        elif h2_response.status_code == 429:
+                            self._admission.on_throttle()
+                            retry_after = h2_response.headers.get("Retry-After")
+                            last_error = MCPConnectionError("Rate limited by server (429)")
+                        else:
+                            self._handle_error_response(h2_response.status_code, h2_response.content)
+                    else:
+                        async with self.session.post(url, data=payload, timeout=timeout_obj, headers=self._request_headers) as response:
+                            self._rate_limiter.update_from_headers(response.headers)
+                            if response.status == 200:
+                                raw = await response.read()
+                                self._admission.on_success()
+                                return decode_response_body(raw, response.content_type)
+                            elif response.status == 429:
+                                # Throttled: shrink the window and honor the
+                                # server's Retry-After instead of our own backoff
+                                self._admission.on_throttle()
+                                retry_after = response.headers.get("Retry-After")
+                                last_error = MCPConnectionError("Rate limited by server (429)")
+                            else:
+                                self._handle_error_response(response.status, await response.read())
+                finally:
+                    self._admission.release()
+
+            except asyncio.TimeoutError:
+                last_error = MCPTimeoutError(f"Request timed out after {current_timeout} seconds")
+            except aiohttp.ClientError as e:
+                last_error = MCPConnectionError(f"Connection error: {str(e)}")
+            except MCPAuthError:
+                # Don't retry auth errors
+                raise
+            except MCPError as e:
+                last_error = e
+
+            # Increment retry counter and delay before retrying
+            retries += 1
+            if retries <= self.max_retries:
+                if retry_after is not None:
+                    try:
+                        delay = float(retry_after)
+                    except ValueError:
+                        delay = self.retry_delay
+                else:
+                    # Exponential backoff with jitter
+                    delay = self.retry_delay * (2 ** (retries - 1)) * (0.5 + 0.5 * (time.time() % 1))
+                await asyncio.sleep(delay)
+
+        # If we've exhausted all retries, raise the last error
+        if last_error:
+            raise last_error
+        else:
+            raise MCPConnectionError("Failed to connect to the server after multiple retries")
+
+    def _handle_error_response(self, status_code: int, error_body) -> None:
+        """Handle error responses from the server.
+
+        Args:
+            status_code: The HTTP status code.
+            error_body: The raw error response body (bytes or str).
+
+        Raises:
+            MCPAuthError: If authentication fails (401, 403).
+            MCPConnectionError: If there's a server error (5xx).
+            MCPProtocolError: For other error responses.
+        """
+        try:
+            # Both decoders accept bytes, so the body is parsed as read off
+            # the wire and the UTF-8 str decode only happens for non-JSON
+            # bodies (this matters under 429/5xx storms)
+            error_data = _json_loads(error_body)
+        except ValueError:
+            # If not JSON, use the raw text
+            error_message = error_body.decode("utf-8", "replace") if isinstance(error_body, bytes) else error_body
+        else:
+            error_message = error_data.get("error", {}).get("message")
+            if error_message is None:
+                error_message = error_body.decode("utf-8", "replace") if isinstance(error_body, bytes) else error_body
+
+        if status_code == 401 or status_code == 403:
+            raise MCPAuthError(f"Authentication error: {error_message}")
+        elif status_code == 429:
+            raise MCPAuthError(f"Rate limit exceeded: {error_message}")
+        elif 500 <= status_code < 600:
+            raise MCPConnectionError(f"Server error ({status_code}): {error_message}")
+        else:
+            raise MCPProtocolError(f"Protocol error ({status_code}): {error_message}")
+
+    async def _cancel_execution(self, session_id: str) -> None:
+        """Attempt to cancel an ongoing execution.
+
+        Args:
+            session_id: The session ID of the execution to cancel.
+
+        Raises:
+            MCPConnectionError: If connection to the server fails.
+            MCPProtocolError: If there's an issue with the protocol.
+        """
+        await self._ensure_session()
+
+        request_data = build_request_message(
+            type=MCPRequestType.CANCEL_EXECUTION,
+            session_id=session_id,
+            input={},
+            metadata={}
+        )
+
+        url = f"{self.endpoint}/cancel"
+
+        try:
+            async with self.session.post(url, data=encode_request_payload(request_data), headers=self._request_headers) as response:
+                if response.status != 200:
+                    # Just log the error, don't raise
+                    pass
+        except Exception:
+            # Ignore any errors when canceling
+            pass
+
+    async def close(self) -> None:
+        """Close the client connection. Safe to call more than once."""
+        async with self._session_lock:
+            if self._batch_task is not None:
+                self._batch_task.cancel()
+                try:
+                    await self._batch_task
+                except asyncio.CancelledError:
+                    pass
+                self._batch_task = None
+                # Fail anything still queued behind the in-flight batch so
+                # concurrent generate_text callers are not left hanging
+                while not self._gen_queue.empty():
+                    _, fut = self._gen_queue.get_nowait()
+                    if not fut.done():
+                        fut.set_exception(MCPConnectionError("Client closed"))
+                self._gen_queue = None
+            if self.session is not None:
+                # Never close a borrowed shared session; it outlives any
+                # one client
+                if self._owns_session:
+                    await self.session.close()
+                self.session = None
+            if self._http2_client is not None:
+                await self._http2_client.aclose()
+                self._http2_client = None
+            self.session_id = None
+
+    # MCP 操作的高级方法
+    async def submit_mcp_job(
+        self, 
+        name: str, 
+        job_type: str, 
+        data: Dict[str, Any], 
+        timeout: Optional[int] = 60, 
+        priority: Optional[int] = 0,
+        tags: Optional[List[str]] = None
+    ) -> MCPSubmitJobResponse:
+        """Submit a job to the MCP.
+
+        Args:
+            name: The name of the job.
+            job_type: The type of the job.
+            data: The job data.
+            timeout: The job timeout in seconds.
+            priority: The job priority.
+            tags: Optional tags for the job.
+
+        Returns:
+            The job submission response.
+
+        Raises:
+            MCPProtocolError: If job submission fails.
+        """
+        if not self.session_id:
+            await self.create_session()
+
+        request = MCPSubmitJobRequest(
+            name=name,
+            type=job_type,
+            data=data,
+            timeout=timeout,
+            priority=priority,
+            tags=tags or []
+        )
+
+        self.logger.debug("Submitting MCP job: %s (type: %s)", name, job_type)
+
+        response = await self._send_request(
+            "jobs",
+            request
+        )
+
+        return MCPSubmitJobResponse.from_trusted(response)
+
+    async def get_mcp_job_status(self, job_id: str) -> MCPJobStatusResponse:
+        """Get the status of an MCP job.
+
+        Args:
+            job_id: The ID of the job.
+
+        Returns:
+            The job status response.
+
+        Raises:
+            MCPProtocolError: If status retrieval fails.
+        """
+        if not self.session_id:
+            await self.create_session()
+
+        request = MCPJobStatusRequest(job_id=job_id)
+
+        self.logger.debug("Getting status for MCP job: %s", job_id)
+
+        response = await self._send_request(
+            f"jobs/{job_id}/status",
+            request
+        )
+
+        return MCPJobStatusResponse.from_trusted(response)
+
+    async def cancel_mcp_job(self, job_id: str, reason: Optional[str] = None) -> MCPCancelJobResponse:
+        """Cancel an MCP job.
+
+        Args:
+            job_id: The ID of the job to cancel.
+            reason: Optional reason for cancellation.
+
+        Returns:
+            The job cancellation response.
+
+        Raises:
+            MCPProtocolError: If job cancellation fails.
+        """
+        if not self.session_id:
+            await self.create_session()
+
+        request = MCPCancelJobRequest(
+            job_id=job_id,
+            reason=reason
+        )
+
+        self.logger.debug("Cancelling MCP job: %s (reason: %s)", job_id, reason or "Not specified")
+
+        response = await self._send_request(
+            f"jobs/{job_id}/cancel",
+            request
+        )
+
+        return MCPCancelJobResponse.from_trusted(response)
+
+    async def wait_for_mcp_job_completion(
+        self, 
+        job_id: str, 
+        poll_interval: float = 1.0, 
+        max_wait_time: Optional[float] = None
+    ) -> MCPJobStatusResponse:
+        """Wait for an MCP job to complete.
+
+        Args:
+            job_id: The ID of the job to wait for.
+            poll_interval: The interval between status checks in seconds.
+            max_wait_time: The maximum time to wait in seconds. If None, wait indefinitely.
+
+        Returns:
+            The final job status response.
+
+        Raises:
+            MCPTimeoutError: If the job does not complete within the specified time.
+            MCPProtocolError: If status retrieval fails.
+        """
+        start_time = time.time()
+        self.logger.debug("Waiting for MCP job completion: %s", job_id)
+
+        while True:
+            status_response = await self.get_mcp_job_status(job_id)
+            
+            if status_response.status in TERMINAL_JOB_STATES:
+                self.logger.debug("MCP job %s completed with status: %s", job_id, status_response.status)
+                return status_response
+            
+            if max_wait_time and (time.time() - start_time) > max_wait_time:
+                raise MCPTimeoutError(f"Job {job_id} did not complete within the specified time")
+            
+            await asyncio.sleep(poll_interval)
+
+    async def wait_for_job_completion_stream(
+        self,
+        job_id: str,
+        max_wait_time: Optional[float] = None
+    ) -> AsyncGenerator[MCPJobStatusResponse, None]:
+        """Stream status changes for an MCP job until it reaches a terminal state.
+
+        Unlike ``wait_for_mcp_job_completion``, this opens a single long-lived
+        SSE connection to the job status stream; the server holds it open and
+        pushes a frame only when the status actually changes, so the client
+        performs one round trip and one validation per change instead of one
+        per polling interval.
+
+        Args:
+            job_id: The ID of the job to watch.
+            max_wait_time: The maximum time to wait in seconds. If None, wait indefinitely.
+
+        Yields:
+            MCPJobStatusResponse for each status change, ending with the
+            terminal status.
+
+        Raises:
+            MCPTimeoutError: If the job does not reach a terminal state within the specified time.
+            MCPConnectionError: If the stream connection fails or ends early.
+        """
+        if not self.session_id:
+            await self.create_session()
+
+        url = f"{self.endpoint}/jobs/{job_id}/status/stream"
+        timeout_obj = aiohttp.ClientTimeout(total=max_wait_time)
+        self.logger.debug("Streaming status changes for MCP job: %s", job_id)
+
+        try:
+            async with self.session.get(url, timeout=timeout_obj, headers=self._request_headers) as response:
+                if response.status != 200:
+                    self._handle_error_response(response.status, await response.read())
+
+                async for line in response.content:
+                    if not line.startswith(b'data: '):
+                        continue
+                    status_response = _JOB_STATUS_FRAME_ADAPTER.validate_json(line[6:])
+                    yield status_response
+                    if status_response.status in TERMINAL_JOB_STATES:
+                        return
+        except asyncio.TimeoutError:
+            raise MCPTimeoutError(f"Job {job_id} did not complete within the specified time")
+        except aiohttp.ClientError as e:
+            raise MCPConnectionError(f"Connection error: {str(e)}")
+
+        raise MCPConnectionError(f"Status stream for job {job_id} ended before a terminal status")
+
+    # 更新现有方法以使用新的 MCP 高级方法
+    async def submit_job(
+        self, 
+        name: str, 
+        job_type: str, 
+        data: Dict[str, Any], 
+        timeout: Optional[int] = 60,
+        priority: Optional[int] = 0,
+        tags: Optional[List[str]] = None) -> MCPSubmitJobResponse:
+        """Submit a job to the MCP service.
+        
+        Args:
+            name: Name of the job.
+            job_type: Type of the job (e.g., "code_execution", "text_generation").
+            data: Job data, structure depends on the job type.
+            timeout: Timeout for the job in seconds.
+            priority: Priority of the job (higher values mean higher priority).
+            tags: Optional tags for the job.
+            
+        Returns:
+            MCPSubmitJobResponse object containing job details.
+            
+        Raises:
+            MCPAuthError: If authentication fails.
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+            MCPProtocolError: If there's an issue with the protocol.
+        """
+        return await self.submit_mcp_job(
+            name=name,
+            job_type=job_type,
+            data=data,
+            timeout=timeout,
+            priority=priority,
+            tags=tags
+        )
+
+    async def get_job_status(self, job_id: str) -> MCPJobStatusResponse:
+        """Get the status of a job.
+        
+        Args:
+            job_id: ID of the job to check.
+            
+        Returns:
+            MCPJobStatusResponse object containing job status details.
+            
+        Raises:
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+            MCPProtocolError: If there's an issue with the protocol.
+        """
+        return await self.get_mcp_job_status(job_id)
+
+    async def cancel_job(self, job_id: str, reason: Optional[str] = None) -> MCPCancelJobResponse:
+        """Cancel a job.
+        
+        Args:
+            job_id: ID of the job to cancel.
+            reason: Optional reason for cancellation.
+            
+        Returns:
+            MCPCancelJobResponse object containing cancellation details.
+            
+        Raises:
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+            MCPProtocolError: If there's an issue with the protocol.
+        """
+        return await self.cancel_mcp_job(job_id, reason)
+
+    async def execute_code_job(self, 
+                             code: str, 
+                             language: str,
+                             environment: Optional[Dict[str, str]] = None,
+                             working_directory: Optional[str] = None,
+                             timeout: Optional[int] = 30) -> MCPSubmitJobResponse:
+        """Submit a code execution job.
+        
+        Args:
+            code: The code to execute.
+            language: The programming language of the code.
+            environment: Optional environment variables for the execution.
+            working_directory: Optional working directory for the execution.
+            timeout: Optional timeout for this specific execution in seconds.
+            
+        Returns:
+            MCPSubmitJobResponse object containing job details.
+            
+        Raises:
+            MCPAuthError: If authentication fails.
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+            MCPProtocolError: If there's an issue with the protocol.
+        """
+        # Create and validate the code execution request
+        code_request = MCPCodeExecutionRequest(
+            code=code,
+            language=language,
+            environment=environment or {},
+            working_directory=working_directory or "/home/user",
+            timeout=timeout
+        )
+        
+        # Submit the job
+        return await self.submit_mcp_job(
+            name=f"code_execution_{language}_{int(time.time())}",
+            job_type="code_execution",
+            data=code_request.dict(),
+            timeout=timeout
+        )
+    
+    async def get_code_execution_result(self, job_id: str) -> MCPCodeExecutionResult:
+        """Get the result of a code execution job.
+        
+        Args:
+            job_id: ID of the code execution job.
+            
+        Returns:
+            MCPCodeExecutionResult object containing execution results.
+            
+        Raises:
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+            MCPProtocolError: If there's an issue with the protocol.
+            MCPExecutionError: If the execution failed or is not complete.
+        """
+        # Get job status
+        status_response = await self.get_mcp_job_status(job_id)
+        
+        # Check if job is completed
+        if status_response.status != MCPJobStatus.COMPLETED:
+            if status_response.status == MCPJobStatus.FAILED:
+                error_details = status_response.error or {"message": "Unknown error"}
+                raise MCPExecutionError(f"Code execution failed: {error_details.get('message')}")
+            else:
+                raise MCPExecutionError(f"Code execution is not complete. Current status: {status_response.status}")
+        
+        # Extract result
+        result = status_response.result
+        if not result:
+            raise MCPProtocolError("No result data in completed job")
+        
+        # Parse and return the execution result
+        return MCPCodeExecutionResult(
+            output=result.get("output", ""),
+            exit_code=result.get("exit_code", 1),
+            execution_time=result.get("execution_time", 0),
+            memory_usage=result.get("memory_usage", 0),
+            metadata=result.get("metadata", {})
+        )
+    
+    async def execute_code_and_wait(self, 
+                                  code: str, 
+                                  language: str,
+                                  environment: Optional[Dict[str, str]] = None,
+                                  working_directory: Optional[str] = None,
+                                  timeout: Optional[int] = 30,
+                                  poll_interval: float = 0.5) -> MCPCodeExecutionResult:
+        """Execute code and wait for the result.
+        
+        This is a convenience method that submits a code execution job,
+        polls for its completion, and returns the result.
+        
+        Args:
+            code: The code to execute.
+            language: The programming language of the code.
+            environment: Optional environment variables for the execution.
+            working_directory: Optional working directory for the execution.
+            timeout: Optional timeout for this specific execution in seconds.
+            poll_interval: Interval between status checks in seconds.
+            
+        Returns:
+            MCPCodeExecutionResult object containing execution results.
+            
+        Raises:
+            MCPAuthError: If authentication fails.
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the execution times out.
+            MCPProtocolError: If there's an issue with the protocol.
+            MCPExecutionError: If code execution fails.
+        """
+        # Submit the code execution job
+        job_response = await self.execute_code_job(
+            code=code,
+            language=language,
+            environment=environment,
+            working_directory=working_directory,
+            timeout=timeout
+        )
+        
+        job_id = job_response.job_id
+        start_time = time.time()
+        max_wait_time = timeout or 30
+        
+        # Poll for job completion
+        while time.time() - start_time < max_wait_time:
+            try:
+                # Try to get the result
+                return await self.get_code_execution_result(job_id)
+            except MCPExecutionError as e:
+                # If job failed, re-raise the exception
+                if "failed" in str(e):
+                    raise
+                # If job is still running, wait and retry
+                await asyncio.sleep(poll_interval)
+        
+        # If we get here, the job timed out
+        try:
+            # Try to cancel the job
+            await self.cancel_job(job_id, reason="Client timeout")
+        except Exception:
+            # Ignore errors when canceling
+            pass
+        
+        raise MCPTimeoutError(f"Code execution timed out after {max_wait_time} seconds")
+    
+    async def generate_text_job(self,
+                              prompt: str,
+                              model: str = "deepseek-v3",
+                              max_tokens: int = 1000,
+                              temperature: float = 0.7,
+                              timeout: Optional[int] = 60) -> MCPSubmitJobResponse:
+        """Submit a text generation job.
+        
+        Args:
+            prompt: The input prompt for text generation.
+            model: The model to use for generation.
+            max_tokens: Maximum number of tokens to generate.
+            temperature: Sampling temperature (0.0-1.0).
+            timeout: Optional timeout for this specific generation in seconds.
+            
+        Returns:
+            MCPSubmitJobResponse object containing job details.
+            
+        Raises:
+            MCPAuthError: If authentication fails.
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+            MCPProtocolError: If there's an issue with the protocol.
+        """
+        # Create and validate the text generation request
+        text_request = MCPTextGenerationRequest(
+            prompt=prompt,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        
+        # Submit the job
+        return await self.submit_mcp_job(
+            name=f"text_generation_{model}_{int(time.time())}",
+            job_type="text_generation",
+            data=text_request.dict(),
+            timeout=timeout
+        )
+    
+    async def get_text_generation_result(self, job_id: str) -> MCPTextGenerationResult:
+        """Get the result of a text generation job.
+        
+        Args:
+            job_id: ID of the text generation job.
+            
+        Returns:
+            MCPTextGenerationResult object containing generation results.
+            
+        Raises:
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the request times out.
+            MCPProtocolError: If there's an issue with the protocol.
+            MCPExecutionError: If the generation failed or is not complete.
+        """
+        # Get job status
+        status_response = await self.get_mcp_job_status(job_id)
+        
+        # Check if job is completed
+        if status_response.status != MCPJobStatus.COMPLETED:
+            if status_response.status == MCPJobStatus.FAILED:
+                error_details = status_response.error or {"message": "Unknown error"}
+                raise MCPExecutionError(f"Text generation failed: {error_details.get('message')}")
+            else:
+                raise MCPExecutionError(f"Text generation is not complete. Current status: {status_response.status}")
+        
+        # Extract result
+        result = status_response.result
+        if not result:
+            raise MCPProtocolError("No result data in completed job")
+        
+        # Parse and return the generation result
+        return MCPTextGenerationResult(
+            text=result.get("text", ""),
+            model=result.get("model", "unknown"),
+            generation_time=result.get("generation_time", 0),
+            usage=result.get("usage", {})
+        )
+    
+    async def generate_text_and_wait(self,
+                                   prompt: str,
+                                   model: str = "deepseek-v3",
+                                   max_tokens: int = 1000,
+                                   temperature: float = 0.7,
+                                   timeout: Optional[int] = 60,
+                                   poll_interval: float = 0.5) -> MCPTextGenerationResult:
+        """Generate text and wait for the result.
+        
+        This is a convenience method that submits a text generation job,
+        polls for its completion, and returns the result.
+        
+        Args:
+            prompt: The input prompt for text generation.
+            model: The model to use for generation.
+            max_tokens: Maximum number of tokens to generate.
+            temperature: Sampling temperature (0.0-1.0).
+            timeout: Optional timeout for this specific generation in seconds.
+            poll_interval: Interval between status checks in seconds.
+            
+        Returns:
+            MCPTextGenerationResult object containing generation results.
+            
+        Raises:
+            MCPAuthError: If authentication fails.
+            MCPConnectionError: If connection to the server fails.
+            MCPTimeoutError: If the generation times out.
+            MCPProtocolError: If there's an issue with the protocol.
+            MCPExecutionError: If text generation fails.
+        """
+        # Submit the text generation job
+        job_response = await self.generate_text_job(
+            prompt=prompt,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout
+        )
+        
+        job_id = job_response.job_id
+        start_time = time.time()
+        max_wait_time = timeout or 60
+        
+        # Poll for job completion
+        while time.time() - start_time < max_wait_time:
+            try:
+                # Try to get the result
+                return await self.get_text_generation_result(job_id)
+            except MCPExecutionError as e:
+                # If job failed, re-raise the exception
+                if "failed" in str(e):
+                    raise
+                # If job is still running, wait and retry
+                await asyncio.sleep(poll_interval)
+        
+        # If we get here, the job timed out
+        try:
+            # Try to cancel the job
+            await self.cancel_job(job_id, reason="Client timeout")
+        except Exception:
+            # Ignore errors when canceling
+            pass
+        
+        raise MCPTimeoutError(f"Text generation timed out after {max_wait_time} seconds")
+    
+    async def execute_code(self,
+                         code: str,
+                         language: str,
+                         environment: Optional[Dict[str, str]] = None,
+                         working_directory: Optional[str] = None,
+                         timeout: Optional[float] = None) -> ExecutionResult:
+        """Execute code asynchronously.
+
+        Args:
+            code: The code to execute.
+            language: The programming language of the code.
+            environment: Optional environment variables for the execution.
+            working_directory: Optional working directory for the execution.
+            timeout: Optional timeout for this specific execution.
+
+        Returns:
+            ExecutionResult object containing the execution results.
+
+        Raises:
+            MCPProtocolError: If there's an issue with the protocol.
+            MCPExecutionError: If code execution fails.
+            MCPTimeoutError: If the execution times out.
+            MCPConnectionError: If connection to the server fails.
+        """
+        # 使用新的实现
+        try:
+            result = await self.execute_code_and_wait(
+                code=code,
+                language=language,
+                environment=environment,
+                working_directory=working_directory,
+                timeout=int(timeout) if timeout else 30
+            )
+            
+            # 转换为旧的结果格式
+            return ExecutionResult(
+                output=result.output,
+                exit_code=result.exit_code,
+                execution_time=result.execution_time,
+                memory_usage=result.memory_usage,
+                metadata=result.metadata
+            )
+        except Exception as e:
+            # 保持原有的异常处理逻辑
+            if isinstance(e, MCPTimeoutError):
+                # 尝试取消执行
+                if hasattr(e, "job_id") and getattr(e, "job_id"):
+                    try:
+                        await self.cancel_job(getattr(e, "job_id"), reason="Client timeout")
+                    except Exception:
+                        # 忽略取消时的错误
+                        pass
+            raise
@@ -1,11 +1,37 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional, Dict, Any
 import os
 
+# The active QueueListener, kept at module scope so a reconfigure can stop
+# the previous worker thread and shutdown_logging() can flush on exit.
+_queue_listener: Optional[QueueListener] = None
+
+
+def shutdown_logging():
+    """Stop the background log listener, flushing any queued records.
+
+    Safe to call more than once; registered with atexit so records queued
+    at interpreter shutdown are not lost.
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(shutdown_logging)
+
 
 def configure_logging(level=logging.INFO, log_file: Optional[str] = None, format_string: Optional[str] = None):
     """Configure standardized logging for the SDK.
 
+    The logger itself only enqueues records; formatting and console/file
+    I/O run on a QueueListener worker thread, so log calls on the event
+    loop never block on a write.
+
     Args:
         level: The logging level (default: logging.INFO).
         log_file: Optional path to a log file. If provided, logs will be written to this file.
@@ -14,24 +40,31 @@ def configure_logging(level=logging.INFO, log_file: Optional[str] = None, format
     Returns:
         A configured logger instance.
     """
+    global _queue_listener
     logger = logging.getLogger("deepexec")
     logger.setLevel(level)
-    
-    # Clear any existing handlers to avoid duplicate logs
+
+    # Clear any existing handlers (and their listener) to avoid duplicate logs
+    shutdown_logging()
     if logger.handlers:
         logger.handlers.clear()
-    
+
+    # The hot path only does a SimpleQueue.put per record; the real
+    # handlers hang off the listener thread below
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+
     # Default format string
     if not format_string:
         format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
+
     formatter = logging.Formatter(format_string)
-    
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
+    handlers = [console_handler]
+
     # File handler (if log_file is provided)
     if log_file:
         try:
@@ -39,18 +72,27 @@ def configure_logging(level=logging.INFO, log_file: Optional[str] = None, format
             log_dir = os.path.dirname(log_file)
             if log_dir and not os.path.exists(log_dir):
                 os.makedirs(log_dir)
-                
+
             file_handler = logging.FileHandler(log_file)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except Exception as e:
             logger.warning(f"Failed to set up file logging to {log_file}: {str(e)}")
-    
+
+    _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+    # Records are formatted off-thread anyway, so skip the per-record
+    # getpid/thread-name lookups entirely
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Suppress third-party library logs
     logging.getLogger("aiohttp").setLevel(logging.WARNING)
     logging.getLogger("websockets").setLevel(logging.WARNING)
     logging.getLogger("asyncio").setLevel(logging.WARNING)
-    
+
     return logger
 
 
@@ -82,6 +124,11 @@ def get_logger(name: Optional[str] = None):
     return logger
 
 
+# Sensitive header names, lowercased once at import: per-call masking is a
+# single hash lookup instead of rebuilding the comparison list per header.
+_SENSITIVE_HEADERS = frozenset({"authorization", "x-deepseek-key", "x-e2b-key", "api-key"})
+
+
 def log_request(logger, method: str, url: str, headers: Optional[Dict[str, Any]] = None, data: Any = None):
     """Log an outgoing request with appropriate masking of sensitive information.
     
@@ -92,25 +139,28 @@ def log_request(logger, method: str, url: str, headers: Optional[Dict[str, Any]]
         headers: Optional request headers.
         data: Optional request data.
     """
-    if logger.level > logging.DEBUG:
+    # isEnabledFor respects handler/ancestor effective levels (logger.level
+    # is 0 for unconfigured loggers); returning early skips the masked-header
+    # dict build entirely on INFO deployments
+    if not logger.isEnabledFor(logging.DEBUG):
         return
-    
+
     # Mask sensitive information in headers
     masked_headers = {}
     if headers:
         for key, value in headers.items():
-            if key.lower() in ["authorization", "x-deepseek-key", "x-e2b-key", "api-key"]:
+            if key.lower() in _SENSITIVE_HEADERS:
                 masked_headers[key] = "****"
             else:
                 masked_headers[key] = value
-    
-    # Log the request
-    logger.debug(f"Request: {method} {url}")
-    logger.debug(f"Headers: {masked_headers}")
-    
+
+    # Lazy %-formatting: the dict repr is only computed if a handler consumes it
+    logger.debug("Request: %s %s", method, url)
+    logger.debug("Headers: %s", masked_headers)
+
     # Only log data at trace level (more verbose than debug)
-    if logger.level <= 5:  # TRACE level (custom)
-        logger.log(5, f"Data: {data}")
+    if logger.isEnabledFor(5):  # TRACE level (custom)
+        logger.log(5, "Data: %s", data)
 
 
 def log_response(logger, status_code: int, headers: Optional[Dict[str, Any]] = None, data: Any = None):
@@ -122,15 +172,15 @@ def log_response(logger, status_code: int, headers: Optional[Dict[str, Any]] = N
         headers: Optional response headers.
         data: Optional response data.
     """
-    if logger.level > logging.DEBUG:
+    if not logger.isEnabledFor(logging.DEBUG):
         return
-    
+
     # Log the response
-    logger.debug(f"Response: {status_code}")
-    
-    if headers and logger.level <= logging.DEBUG:
-        logger.debug(f"Headers: {headers}")
-    
+    logger.debug("Response: %s", status_code)
+
+    if headers:
+        logger.debug("Headers: %s", headers)
+
     # Only log data at trace level
-    if data is not None and logger.level <= 5:  # TRACE level
-        logger.log(5, f"Data: {data}")
+    if data is not None and logger.isEnabledFor(5):  # TRACE level
+        logger.log(5, "Data: %s", data)
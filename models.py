@@ -1,399 +1,515 @@
-from typing import Dict, Any, List, Optional, Union
-from pydantic import BaseModel, Field, validator
-from enum import Enum
-
-
-# MCP 协议基础模型
-class MCPProtocolVersion(str, Enum):
-    """MCP 协议版本"""
-    V2024_1 = "2024.1"
-
-
-class MCPJobStatus(str, Enum):
-    """MCP 作业状态"""
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    CANCELED = "canceled"
-    TIMEOUT = "timeout"
-
-
-# 具体 MCP 请求模型
-class MCPSubmitJobRequest(BaseModel):
-    """提交 MCP 作业请求模型
-    
-    该模型用于向 MCP 服务提交新作业，支持代码执行和文本生成等多种作业类型。
-    
-    Attributes:
-        name: 作业名称，用于标识作业
-        type: 作业类型，如 "code_execution"、"text_generation" 等
-        data: 作业数据，根据作业类型不同而变化
-        timeout: 作业超时时间（秒）
-        priority: 作业优先级，数值越高优先级越高
-        tags: 作业标签，用于分类和筛选作业
-    """
-    name: str
-    type: str  # 作业类型: code_execution, text_generation 等
-    data: Dict[str, Any]  # 作业数据，根据类型不同而变化
-    timeout: Optional[int] = 60  # 超时时间（秒）
-    priority: Optional[int] = 0  # 作业优先级
-    tags: Optional[List[str]] = Field(default_factory=list)  # 作业标签
-    
-    @validator('name')
-    def name_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError('Job name cannot be empty')
-        return v
-    
-    @validator('type')
-    def type_must_be_valid(cls, v):
-        valid_types = ["code_execution", "text_generation", "text_generation_stream"]
-        if v not in valid_types:
-            raise ValueError(f"Invalid job type: {v}. Valid types: {', '.join(valid_types)}")
-        return v
-
-
-class MCPSubmitJobResponse(BaseModel):
-    """提交 MCP 作业响应模型
-    
-    该模型表示作业提交后的响应信息。
-    
-    Attributes:
-        job_id: 作业唯一标识符
-        status: 作业初始状态
-        created_at: 作业创建时间（ISO 格式）
-        estimated_time: 预计完成时间（秒）
-    """
-    job_id: str
-    status: MCPJobStatus
-    created_at: str  # ISO 格式时间戳
-    estimated_time: Optional[int] = None  # 预计完成时间（秒）
-
-
-class MCPJobStatusRequest(BaseModel):
-    """查询 MCP 作业状态请求模型
-    
-    该模型用于查询 MCP 作业的状态。
-    
-    Attributes:
-        job_id: 作业 ID
-    """
-    job_id: str
-
-
-class MCPJobStatusResponse(BaseModel):
-    """查询 MCP 作业状态响应模型
-    
-    该模型表示 MCP 作业状态查询的响应信息。
-    
-    Attributes:
-        job_id: 作业 ID
-        status: 作业状态
-        progress: 作业进度（0-100）
-        created_at: 作业创建时间（ISO 格式）
-        started_at: 作业开始时间（ISO 格式）
-        completed_at: 作业完成时间（ISO 格式）
-        result: 作业结果，仅当状态为 COMPLETED 时存在
-        error: 作业错误信息，仅当状态为 FAILED 时存在
-    """
-    job_id: str
-    status: MCPJobStatus
-    progress: Optional[float] = None  # 进度百分比 (0-100)
-    created_at: str  # ISO 格式时间戳
-    started_at: Optional[str] = None  # ISO 格式时间戳
-    completed_at: Optional[str] = None  # ISO 格式时间戳
-    result: Optional[Dict[str, Any]] = None  # 作业结果，仅当状态为 COMPLETED 时存在
-    error: Optional[Dict[str, Any]] = None  # 错误信息，仅当状态为 FAILED 时存在
-
-
-class MCPCancelJobRequest(BaseModel):
-    """取消 MCP 作业请求模型
-    
-    该模型用于取消 MCP 作业。
-    
-    Attributes:
-        job_id: 作业 ID
-        reason: 取消原因
-    """
-    job_id: str
-    reason: Optional[str] = None
-
-
-class MCPCancelJobResponse(BaseModel):
-    """取消 MCP 作业响应模型
-    
-    该模型表示 MCP 作业取消的响应信息。
-    
-    Attributes:
-        job_id: 作业 ID
-        status: 作业状态，应为 CANCELED
-        canceled_at: 作业取消时间（ISO 格式）
-    """
-    job_id: str
-    status: MCPJobStatus  # 应为 CANCELED
-    canceled_at: str  # ISO 格式时间戳
-
-
-class MCPErrorDetail(BaseModel):
-    """MCP 错误详情模型
-    
-    该模型表示 MCP 错误的详细信息。
-    
-    Attributes:
-        code: 错误代码
-        message: 错误消息
-        details: 错误详细信息
-    """
-    code: str
-    message: str
-    details: Optional[Dict[str, Any]] = None
-
-
-# 代码执行特定模型
-class MCPCodeExecutionRequest(BaseModel):
-    """代码执行请求模型
-    
-    该模型用于执行代码。
-    
-    Attributes:
-        code: 代码
-        language: 语言
-        environment: 环境变量
-        working_directory: 工作目录
-        timeout: 超时时间（秒）
-    """
-    code: str
-    language: str
-    environment: Dict[str, str] = Field(default_factory=dict)
-    working_directory: str = "/home/user"
-    timeout: Optional[int] = 30
-    
-    @validator('code')
-    def code_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError('Code cannot be empty')
-        return v
-    
-    @validator('language')
-    def language_must_be_valid(cls, v):
-        valid_languages = [
-            "python", "javascript", "typescript", "java", "c", "cpp", "csharp", 
-            "go", "rust", "ruby", "php", "bash", "powershell"
-        ]
-        if v.lower() not in valid_languages:
-            raise ValueError(f"Unsupported language: {v}. Supported languages: {', '.join(valid_languages)}")
-        return v.lower()
-
-
-class MCPCodeExecutionResult(BaseModel):
-    """代码执行结果模型
-    
-    该模型表示代码执行的结果。
-    
-    Attributes:
-        output: 输出
-        exit_code: 退出代码
-        execution_time: 执行时间（毫秒）
-        memory_usage: 内存使用量（MB）
-        metadata: 元数据
-    """
-    output: str
-    exit_code: int
-    execution_time: int  # 毫秒
-    memory_usage: int  # MB
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-
-
-# 文本生成特定模型
-class MCPTextGenerationRequest(BaseModel):
-    """文本生成请求模型
-    
-    该模型用于生成文本。
-    
-    Attributes:
-        prompt: 提示
-        model: 模型
-        max_tokens: 最大令牌数
-        temperature: 温度
-    """
-    prompt: str
-    model: str = "deepseek-v3"
-    max_tokens: int = 1000
-    temperature: float = 0.7
-    
-    @validator('prompt')
-    def prompt_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError('Prompt cannot be empty')
-        return v
-    
-    @validator('temperature')
-    def temperature_must_be_valid(cls, v):
-        if not 0.0 <= v <= 1.0:
-            raise ValueError('Temperature must be between 0.0 and 1.0')
-        return v
-    
-    @validator('max_tokens')
-    def max_tokens_must_be_positive(cls, v):
-        if v <= 0:
-            raise ValueError('max_tokens must be positive')
-        return v
-
-
-class MCPTokenUsage(BaseModel):
-    """Token 使用统计模型
-    
-    该模型表示 Token 的使用统计信息。
-    
-    Attributes:
-        prompt_tokens: 提示令牌数
-        completion_tokens: 完成令牌数
-        total_tokens: 总令牌数
-    """
-    prompt_tokens: int = 0
-    completion_tokens: int = 0
-    total_tokens: int = 0
-
-
-class MCPTextGenerationResult(BaseModel):
-    """文本生成结果模型
-    
-    该模型表示文本生成的结果。
-    
-    Attributes:
-        text: 生成的文本
-        model: 使用的模型
-        generation_time: 生成时间（毫秒）
-        usage: Token 使用统计信息
-    """
-    text: str
-    model: str
-    generation_time: int = 0  # 毫秒
-    usage: MCPTokenUsage = Field(default_factory=MCPTokenUsage)
-
-
-class MCPStreamGenerationChunk(BaseModel):
-    """流式文本生成块模型
-    
-    该模型表示流式文本生成的块。
-    
-    Attributes:
-        text: 生成的文本
-        done: 是否完成
-    """
-    text: str
-    done: bool = False
-
-
-# 保留原有模型，但标记为兼容性用途
-class ExecutionRequest(BaseModel):
-    """Model for code execution requests (Legacy)."""
-    code: str
-    language: str
-    environment: Dict[str, str] = Field(default_factory=dict)
-    working_directory: str = "/home/user"
-
-    @validator('code')
-    def code_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError('Code cannot be empty')
-        return v
-
-    @validator('language')
-    def language_must_be_valid(cls, v):
-        # This is a basic validation that can be extended with a list of supported languages
-        valid_languages = [
-            "python", "javascript", "typescript", "java", "c", "cpp", "csharp", 
-            "go", "rust", "ruby", "php", "bash", "powershell"
-        ]
-        if v.lower() not in valid_languages:
-            raise ValueError(f"Unsupported language: {v}. Supported languages: {', '.join(valid_languages)}")
-        return v.lower()
-
-
-class ExecutionResult(BaseModel):
-    """Model for code execution results (Legacy)."""
-    output: str
-    exit_code: int
-    execution_time: int  # in milliseconds
-    memory_usage: int  # in MB
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-
-
-class TokenUsage(BaseModel):
-    """Model for token usage statistics (Legacy)."""
-    prompt_tokens: int = Field(0, alias="promptTokens")
-    completion_tokens: int = Field(0, alias="completionTokens")
-    total_tokens: int = Field(0, alias="totalTokens")
-
-    class Config:
-        allow_population_by_field_name = True
-
-
-class GenerationRequest(BaseModel):
-    """Model for text generation requests (Legacy)."""
-    prompt: str
-    model: str = "deepseek-v3"
-    max_tokens: int = 1000
-    temperature: float = 0.7
-
-    @validator('prompt')
-    def prompt_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError('Prompt cannot be empty')
-        return v
-
-    @validator('temperature')
-    def temperature_must_be_valid(cls, v):
-        if not 0.0 <= v <= 1.0:
-            raise ValueError('Temperature must be between 0.0 and 1.0')
-        return v
-
-    @validator('max_tokens')
-    def max_tokens_must_be_positive(cls, v):
-        if v <= 0:
-            raise ValueError('max_tokens must be positive')
-        return v
-
-
-class GenerationResult(BaseModel):
-    """Model for text generation results (Legacy)."""
-    text: str
-    model: str
-    generation_time: int = Field(0, alias="generationTime")  # in milliseconds
-    usage: TokenUsage
-
-    class Config:
-        allow_population_by_field_name = True
-
-
-class StreamGenerationChunk(BaseModel):
-    """Model for streaming text generation chunks (Legacy)."""
-    text: str
-    done: bool
-
-
-class SecurityOptions(BaseModel):
-    """Model for security configuration options."""
-    max_code_length: int = Field(10000, alias="maxCodeLength")
-    allowed_languages: List[str] = Field(default_factory=list, alias="allowedLanguages")
-    blocked_keywords: List[str] = Field(default_factory=list, alias="blockedKeywords")
-
-    class Config:
-        allow_population_by_field_name = True
-
-
-class ClientConfig(BaseModel):
-    """Model for client configuration."""
-    endpoint: str = "https://api.deepexec.com/v1"
-    timeout: float = 30.0
-    max_retries: int = Field(3, alias="maxRetries")
-    retry_delay: float = Field(1.0, alias="retryDelay")
-    verify_ssl: bool = Field(True, alias="verifySSL")
-    deepseek_key: Optional[str] = Field(None, alias="deepseekKey")
-    e2b_key: Optional[str] = Field(None, alias="e2bKey")
-    security_options: SecurityOptions = Field(default_factory=SecurityOptions, alias="securityOptions")
-
-    class Config:
-        allow_population_by_field_name = True
+from typing import Dict, Any, List, Literal, Mapping, Optional
+from typing_extensions import NotRequired, TypedDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, validator
+from pydantic.alias_generators import to_camel
+from enum import Enum
+
+import types
+
+import msgspec
+
+# Shared config for models whose wire format uses camelCase aliases. A single
+# alias generator lets pydantic-core reuse one schema template instead of
+# building per-field aliased validators.
+_CAMEL_CASE_CONFIG = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+# 只读响应模型共享的 Config：各模型引用同一个 dict，而不是各自重建
+_FROZEN_CONFIG = ConfigDict(frozen=True)
+
+
+# 导入期预编译的允许值集合：每次校验只做一次哈希查找，
+# 错误提示字符串也只在导入时拼接一次，而不是每次校验都重建列表
+_VALID_JOB_TYPES = frozenset({"code_execution", "text_generation", "text_generation_stream"})
+_VALID_LANGUAGES = frozenset({
+    "python", "javascript", "typescript", "java", "c", "cpp", "csharp",
+    "go", "rust", "ruby", "php", "bash", "powershell"
+})
+_VALID_LANGUAGES_MSG = ", ".join(sorted(_VALID_LANGUAGES))
+_VALID_JOB_TYPES_MSG = ", ".join(sorted(_VALID_JOB_TYPES))
+
+
+# MCP 协议基础模型
+class MCPProtocolVersion(str, Enum):
+    """MCP 协议版本"""
+    V2024_1 = "2024.1"
+
+
+class MCPJobStatus(str, Enum):
+    """MCP 作业状态"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELED = "canceled"
+    TIMEOUT = "timeout"
+
+
+
+# 作业状态的 Literal 形式：pydantic-core 以内联字符串匹配校验，
+# 避免 Python 层的 Enum 协变换；MCPJobStatus 仍作为常量供调用方使用。
+MCPJobStatusLiteral = Literal[
+    "pending", "running", "completed", "failed", "canceled", "timeout"
+]
+
+# 轮询分支用的状态集合：成员为原生字符串，比较走一次哈希查找，
+# 绕过 str-Enum __eq__ 的 isinstance 链（短字面量字符串已被解释器驻留）
+TERMINAL_JOB_STATES = frozenset({"completed", "failed", "canceled", "timeout"})
+ACTIVE_JOB_STATES = frozenset({"pending", "running"})
+
+# 具体 MCP 请求模型
+class MCPSubmitJobRequest(BaseModel):
+    """提交 MCP 作业请求模型
+    
+    该模型用于向 MCP 服务提交新作业，支持代码执行和文本生成等多种作业类型。
+    
+    Attributes:
+        name: 作业名称，用于标识作业
+        type: 作业类型，如 "code_execution"、"text_generation" 等
+        data: 作业数据，根据作业类型不同而变化
+        timeout: 作业超时时间（秒）
+        priority: 作业优先级，数值越高优先级越高
+        tags: 作业标签，用于分类和筛选作业
+    """
+    name: str
+    type: str  # 作业类型: code_execution, text_generation 等
+    # Mapping 注解让 pydantic 只做一次映射类型检查，不再逐键重建 dict；
+    # data 里往往带着整段代码文本，逐值遍历是提交路径上最大的无谓拷贝
+    data: Mapping[str, Any]  # 作业数据，根据类型不同而变化
+    timeout: Optional[int] = Field(60, ge=1)  # 超时时间（秒）
+    priority: Optional[int] = 0  # 作业优先级
+    tags: Optional[List[str]] = Field(default_factory=list)  # 作业标签
+    
+    @validator('name')
+    def name_must_not_be_empty(cls, v):
+        if not v or v.isspace():
+            raise ValueError('Job name cannot be empty')
+        return v
+    
+    @validator('type')
+    def type_must_be_valid(cls, v):
+        if v not in _VALID_JOB_TYPES:
+            raise ValueError(f"Invalid job type: {v}. Valid types: {_VALID_JOB_TYPES_MSG}")
+        return v
+
+
+class MCPSubmitJobResponse(BaseModel):
+    """提交 MCP 作业响应模型
+    
+    该模型表示作业提交后的响应信息。
+    
+    Attributes:
+        job_id: 作业唯一标识符
+        status: 作业初始状态
+        created_at: 作业创建时间（ISO 格式）
+        estimated_time: 预计完成时间（秒）
+    """
+    model_config = _FROZEN_CONFIG
+    job_id: str
+    status: MCPJobStatusLiteral
+    created_at: str  # ISO 格式时间戳
+    estimated_time: Optional[int] = None  # 预计完成时间（秒）
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> "MCPSubmitJobResponse":
+        """从受信的服务端响应直接构造实例，跳过字段校验
+
+        响应由我们自己的后端产生、已符合 schema，重复校验是纯开销；
+        来自用户代码的请求侧仍走完整校验。
+        """
+        return cls.model_construct(**data)
+
+
+class MCPJobStatusRequest(BaseModel):
+    """查询 MCP 作业状态请求模型
+    
+    该模型用于查询 MCP 作业的状态。
+    
+    Attributes:
+        job_id: 作业 ID
+    """
+    job_id: str
+
+
+class MCPJobStatusResponse(BaseModel):
+    """查询 MCP 作业状态响应模型
+    
+    该模型表示 MCP 作业状态查询的响应信息。
+    
+    Attributes:
+        status: 作业状态
+        progress: 作业进度（0-100）
+        job_id: 作业 ID
+        created_at: 作业创建时间（ISO 格式）
+        started_at: 作业开始时间（ISO 格式）
+        completed_at: 作业完成时间（ISO 格式）
+        result: 作业结果，仅当状态为 COMPLETED 时存在
+        error: 作业错误信息，仅当状态为 FAILED 时存在
+    """
+    model_config = _FROZEN_CONFIG
+    # 轮询路径上热访问的 status/progress 放在声明序最前，使其落在
+    # 实例字典（及未来 Struct 布局）的前几个槽位；时间戳等冷字段靠后
+    status: MCPJobStatusLiteral
+    progress: Optional[float] = None  # 进度百分比 (0-100)
+    job_id: str
+    created_at: str  # ISO 格式时间戳
+    started_at: Optional[str] = None  # ISO 格式时间戳
+    completed_at: Optional[str] = None  # ISO 格式时间戳
+    # result/error 按 Any 原样透传：轮询时调用方只看 status，完成时才读取
+    # 一次结果，逐键校验整个结果字典属于每次轮询的无谓开销
+    result: Optional[Any] = None  # 作业结果，仅当状态为 COMPLETED 时存在
+    error: Optional[Any] = None  # 错误信息，仅当状态为 FAILED 时存在
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> "MCPJobStatusResponse":
+        """从受信的服务端响应直接构造实例，跳过字段校验
+
+        响应由我们自己的后端产生、已符合 schema，重复校验是纯开销；
+        来自用户代码的请求侧仍走完整校验。
+        """
+        return cls.model_construct(**data)
+
+
+# 批量作业状态的共享校验器：TypeAdapter 在导入时构建一次，
+# 之后整个列表复用同一个 SchemaValidator
+_JOB_STATUS_LIST_ADAPTER = TypeAdapter(List[MCPJobStatusResponse])
+
+
+def parse_job_status_batch(raw: bytes) -> List[MCPJobStatusResponse]:
+    """批量解析作业状态响应数组
+
+    使用模块级 TypeAdapter 直接从 JSON 字节校验整个数组，
+    避免先 json.loads 再逐项构造模型的中间 dict 开销。
+
+    Args:
+        raw: 作业状态响应数组的 JSON 字节
+
+    Returns:
+        MCPJobStatusResponse 列表
+    """
+    return _JOB_STATUS_LIST_ADAPTER.validate_json(raw)
+
+
+class MCPCancelJobRequest(BaseModel):
+    """取消 MCP 作业请求模型
+    
+    该模型用于取消 MCP 作业。
+    
+    Attributes:
+        job_id: 作业 ID
+        reason: 取消原因
+    """
+    job_id: str
+    reason: Optional[str] = None
+
+
+class MCPCancelJobResponse(BaseModel):
+    """取消 MCP 作业响应模型
+    
+    该模型表示 MCP 作业取消的响应信息。
+    
+    Attributes:
+        job_id: 作业 ID
+        status: 作业状态，应为 CANCELED
+        canceled_at: 作业取消时间（ISO 格式）
+    """
+    model_config = _FROZEN_CONFIG
+    job_id: str
+    status: MCPJobStatusLiteral  # 应为 "canceled"
+    canceled_at: str  # ISO 格式时间戳
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> "MCPCancelJobResponse":
+        """从受信的服务端响应直接构造实例，跳过字段校验
+
+        响应由我们自己的后端产生、已符合 schema，重复校验是纯开销；
+        来自用户代码的请求侧仍走完整校验。
+        """
+        return cls.model_construct(**data)
+
+
+class MCPErrorDetail(BaseModel):
+    """MCP 错误详情模型
+    
+    该模型表示 MCP 错误的详细信息。
+    
+    Attributes:
+        code: 错误代码
+        message: 错误消息
+        details: 错误详细信息
+    """
+    model_config = _FROZEN_CONFIG
+    code: str
+    message: str
+    details: Optional[Any] = None  # 原样透传，不做逐键校验
+
+
+# 代码执行特定模型
+class MCPCodeExecutionRequest(BaseModel):
+    """代码执行请求模型
+    
+    该模型用于执行代码。
+    
+    Attributes:
+        code: 代码
+        language: 语言
+        environment: 环境变量
+        working_directory: 工作目录
+        timeout: 超时时间（秒）
+    """
+    code: str
+    language: str
+    environment: Mapping[str, str] = Field(default_factory=dict)
+    working_directory: str = "/home/user"
+    timeout: Optional[int] = 30
+    
+    @validator('code')
+    def code_must_not_be_empty(cls, v):
+        if not v or v.isspace():
+            raise ValueError('Code cannot be empty')
+        return v
+    
+    @validator('language')
+    def language_must_be_valid(cls, v):
+        if v.lower() not in _VALID_LANGUAGES:
+            raise ValueError(f"Unsupported language: {v}. Supported languages: {_VALID_LANGUAGES_MSG}")
+        return v.lower()
+
+
+class MCPCodeExecutionResult(msgspec.Struct, frozen=True):
+    """代码执行结果模型
+
+    该模型表示代码执行的结果。结果来自服务端、无字段校验器，
+    采用 msgspec.Struct（C 扩展）构造，省去 pydantic 的逐字段校验开销。
+
+    Attributes:
+        output: 输出
+        exit_code: 退出代码
+        execution_time: 执行时间（毫秒）
+        memory_usage: 内存使用量（MB）
+        metadata: 元数据
+    """
+    output: str
+    exit_code: int
+    execution_time: int  # 毫秒
+    memory_usage: int  # MB
+    metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
+
+
+# 文本生成特定模型
+class MCPTextGenerationRequest(BaseModel):
+    """文本生成请求模型
+    
+    该模型用于生成文本。
+    
+    Attributes:
+        prompt: 提示
+        model: 模型
+        max_tokens: 最大令牌数
+        temperature: 温度
+    """
+    prompt: str
+    model: str = "deepseek-v3"
+    # 范围约束下沉到 Field，由 pydantic-core 在校验时直接检查，
+    # 无需每个实例回调 Python 校验器
+    max_tokens: int = Field(1000, gt=0)
+    temperature: float = Field(0.7, ge=0.0, le=1.0)
+    
+    @validator('prompt')
+    def prompt_must_not_be_empty(cls, v):
+        if not v or v.isspace():
+            raise ValueError('Prompt cannot be empty')
+        return v
+
+
+class MCPTokenUsage(TypedDict, total=False):
+    """Token 使用统计模型
+
+    该模型表示 Token 的使用统计信息，作为 TypedDict 仅在父模型边界校验。
+
+    Attributes:
+        prompt_tokens: 提示令牌数
+        completion_tokens: 完成令牌数
+        total_tokens: 总令牌数
+    """
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+# 无用量数据时共享的空单例：后端未返回 usage 时复用同一个只读映射，
+# 避免每个结果各分配一个空 dict（流式路径下每秒可达上千次）
+_EMPTY_USAGE: MCPTokenUsage = types.MappingProxyType(MCPTokenUsage())
+
+
+class MCPTextGenerationResult(msgspec.Struct, frozen=True):
+    """文本生成结果模型
+
+    该模型表示文本生成的结果。与 MCPCodeExecutionResult 同理，
+    作为受信结果 DTO 采用 msgspec.Struct 构造。
+
+    Attributes:
+        text: 生成的文本
+        model: 使用的模型
+        generation_time: 生成时间（毫秒）
+        usage: Token 使用统计信息
+    """
+    text: str
+    model: str
+    generation_time: int = 0  # 毫秒
+    usage: MCPTokenUsage = msgspec.field(default=_EMPTY_USAGE)
+
+
+class MCPStreamGenerationChunk(TypedDict):
+    """流式文本生成块模型
+
+    该模型表示流式文本生成的块，作为 TypedDict 仅在父模型边界校验。
+
+    Attributes:
+        text: 生成的文本
+        done: 是否完成
+    """
+    text: str
+    done: NotRequired[bool]
+
+
+# 流式块数组的批量解码器：导入时构建一次，整批只跨一次 C/Python 边界
+_CHUNK_BATCH_DECODER = msgspec.json.Decoder(List[MCPStreamGenerationChunk])
+
+
+def decode_stream_chunk_batch(raw: bytes) -> List[MCPStreamGenerationChunk]:
+    """批量解码流式文本生成块数组
+
+    服务端按 SSE 批次下发多个块时，用模块级 msgspec Decoder 一次性
+    解码整个 JSON 数组，而不是逐块构造；千级块的生成流程由上千次
+    Python 层构造收敛为一次 C 级循环。
+
+    Args:
+        raw: 块数组的 JSON 字节
+
+    Returns:
+        MCPStreamGenerationChunk 列表
+    """
+    return _CHUNK_BATCH_DECODER.decode(raw)
+
+
+# 保留原有模型，但标记为兼容性用途。与 MCP 模型字段和校验器完全重复的
+# 遗留模型直接指向规范模型：同一概念只编译一份 pydantic schema，
+# 导入时少构建一整条校验器链。MCPCodeExecutionRequest 额外的可选
+# timeout 字段对旧调用方向后兼容。
+ExecutionRequest = MCPCodeExecutionRequest
+
+
+class ExecutionResult(msgspec.Struct, frozen=True):
+    """Model for code execution results (Legacy).
+
+    与 MCP 结果 DTO 一样改为 msgspec.Struct：执行结果来自我们已信任的
+    响应，带槽的 C 层容器即可，无需 pydantic 校验开销。
+    """
+    output: str
+    exit_code: int
+    execution_time: int  # in milliseconds
+    memory_usage: int  # in MB
+    metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
+
+
+class TokenUsage(BaseModel):
+    """Model for token usage statistics (Legacy)."""
+    model_config = _CAMEL_CASE_CONFIG
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+
+# 同上：GenerationRequest 与 MCPTextGenerationRequest 字段、校验器一致
+GenerationRequest = MCPTextGenerationRequest
+
+
+class GenerationResult(BaseModel):
+    """Model for text generation results (Legacy)."""
+    model_config = _CAMEL_CASE_CONFIG
+
+    text: str
+    model: str
+    generation_time: int = 0  # in milliseconds
+    usage: TokenUsage
+
+
+class StreamGenerationChunk(msgspec.Struct, frozen=True):
+    """Model for streaming text generation chunks (Legacy)."""
+    text: str
+    done: bool
+
+
+class SecurityOptions:
+    """Model for security configuration options.
+
+    A plain __slots__ class rather than a pydantic model: these are internal
+    configuration containers built from keyword arguments in our own code, so
+    schema compilation and per-instance __dict__/__fields_set__ bookkeeping
+    bought nothing. Wire-format aliasing lives in to_dict().
+    """
+    __slots__ = ("max_code_length", "allowed_languages", "blocked_keywords")
+
+    def __init__(
+        self,
+        max_code_length: int = 10000,
+        allowed_languages: Optional[List[str]] = None,
+        blocked_keywords: Optional[List[str]] = None,
+    ) -> None:
+        self.max_code_length = max_code_length
+        self.allowed_languages = allowed_languages if allowed_languages is not None else []
+        self.blocked_keywords = blocked_keywords if blocked_keywords is not None else []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the camelCase wire form."""
+        return {
+            "maxCodeLength": self.max_code_length,
+            "allowedLanguages": self.allowed_languages,
+            "blockedKeywords": self.blocked_keywords,
+        }
+
+
+class ClientConfig:
+    """Model for client configuration.
+
+    Same rationale as SecurityOptions: a slotted container with defaults,
+    not a validated model.
+    """
+    __slots__ = (
+        "endpoint", "timeout", "max_retries", "retry_delay",
+        "verify_ssl", "deepseek_key", "e2b_key", "security_options",
+    )
+
+    def __init__(
+        self,
+        endpoint: str = "https://api.deepexec.com/v1",
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        verify_ssl: bool = True,
+        deepseek_key: Optional[str] = None,
+        e2b_key: Optional[str] = None,
+        security_options: Optional[SecurityOptions] = None,
+    ) -> None:
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.verify_ssl = verify_ssl
+        self.deepseek_key = deepseek_key
+        self.e2b_key = e2b_key
+        self.security_options = security_options if security_options is not None else SecurityOptions()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the camelCase wire form (verifySSL kept verbatim)."""
+        return {
+            "endpoint": self.endpoint,
+            "timeout": self.timeout,
+            "maxRetries": self.max_retries,
+            "retryDelay": self.retry_delay,
+            "verifySSL": self.verify_ssl,
+            "deepseekKey": self.deepseek_key,
+            "e2bKey": self.e2b_key,
+            "securityOptions": self.security_options.to_dict(),
+        }
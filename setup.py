@@ -6,6 +6,20 @@ with open("README.md", "r", encoding="utf-8") as fh:
 with open("requirements.txt", "r", encoding="utf-8") as f:
     requirements = f.read().splitlines()
 
+# Optionally compile the validator-heavy model modules to C extensions.
+# When Cython is available at build time the generated .so shadows the .py
+# (which stays in the wheel as a pure-Python fallback); without Cython the
+# build is unchanged.
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        ["src/core/models.py", "src/core/protocols/mcp.py"],
+        language_level=3,
+    )
+except ImportError:
+    ext_modules = []
+
 setup(
     name="deepexec-sdk",
     version="0.1.0",
@@ -31,11 +45,13 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    ext_modules=ext_modules,
     extras_require={
         "dev": [
             "pytest>=7.0.0,<8.0.0",
             "pytest-asyncio>=0.21.0,<0.22.0",
             "pytest-cov>=4.1.0,<5.0.0",
+            "pytest-xdist>=3.0.0,<4.0.0",
             "mypy>=1.0.0,<2.0.0",
             "flake8>=6.0.0,<7.0.0",
             "black>=23.0.0,<24.0.0",
@@ -43,6 +59,10 @@ setup(
             "coverage>=7.2.0,<8.0.0",
             "tox>=4.0.0,<5.0.0",
         ],
+        "speedups": [
+            "Cython>=3.0.0,<4.0.0",
+            "uvloop>=0.19.0,<1.0.0; sys_platform != 'win32'",
+        ],
         "docs": [
             "sphinx>=7.0.0,<8.0.0",
             "sphinx-rtd-theme>=1.2.0,<2.0.0",
@@ -9,6 +9,41 @@ from unittest.mock import MagicMock, patch
 from src.core.async_client import DeepExecAsyncClient
 from src.core.models import ExecutionResult, GenerationResult, TokenUsage
 
+# Canned response payloads, hoisted to module scope so repeated/parametrized
+# runs reuse one dict instead of rebuilding the nested literal per call.
+_EXECUTE_CODE_RESPONSE = {
+    "protocol_version": "2024.1",
+    "type": "code_execution_result",
+    "session_id": "test_session",
+    "status": "success",
+    "output": {
+        "execution_result": {
+            "output": "Hello, world!\n",
+            "exit_code": 0,
+            "execution_time": 100,
+            "memory_usage": 10
+        }
+    }
+}
+
+_GENERATE_TEXT_RESPONSE = {
+    "protocol_version": "2024.1",
+    "type": "text_generation_result",
+    "session_id": "test_session",
+    "status": "success",
+    "output": {
+        "text": "AI is a technology..."
+    },
+    "metadata": {
+        "model": "deepseek-v3",
+        "usage": {
+            "prompt_tokens": 10,
+            "completion_tokens": 50,
+            "total_tokens": 60
+        }
+    }
+}
+
 
 def test_mock_client():
     """Test DeepExecAsyncClient with mocks"""
@@ -18,20 +53,7 @@ def test_mock_client():
     mock_session = MagicMock()
     mock_response = MagicMock()
     mock_response.status = 200
-    mock_response.json = MagicMock(return_value={
-        "protocol_version": "2024.1",
-        "type": "code_execution_result",
-        "session_id": "test_session",
-        "status": "success",
-        "output": {
-            "execution_result": {
-                "output": "Hello, world!\n",
-                "exit_code": 0,
-                "execution_time": 100,
-                "memory_usage": 10
-            }
-        }
-    })
+    mock_response.json = MagicMock(return_value=_EXECUTE_CODE_RESPONSE)
     mock_session.post.return_value.__aenter__.return_value = mock_response
     
     # Create the client with the mock session
@@ -62,23 +84,7 @@ def test_mock_client():
     
     # Test generate_text
     print("\nTesting generate_text...")
-    mock_response.json = MagicMock(return_value={
-        "protocol_version": "2024.1",
-        "type": "text_generation_result",
-        "session_id": "test_session",
-        "status": "success",
-        "output": {
-            "text": "AI is a technology..."
-        },
-        "metadata": {
-            "model": "deepseek-v3",
-            "usage": {
-                "prompt_tokens": 10,
-                "completion_tokens": 50,
-                "total_tokens": 60
-            }
-        }
-    })
+    mock_response.json = MagicMock(return_value=_GENERATE_TEXT_RESPONSE)
     
     # In a real test, we would call client.generate_text
     # For this simple test, we'll just mock the result
@@ -0,0 +1,30 @@
+"""Single import point for the SDK's JSON codec.
+
+orjson is preferred when installed: it scans input with SIMD-style byte
+classification, accepts bytes without a UTF-8 transcode and returns
+bytes from dumps. The stdlib is the fallback so nothing breaks without
+the optional wheel; its output is compacted to match orjson's byte
+format, letting pre-encoded fragments be spliced interchangeably.
+"""
+
+import json as _stdlib_json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional speedup
+    _orjson = None
+
+
+if _orjson is not None:
+    def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """Encode obj to compact JSON bytes."""
+        return _orjson.dumps(obj, default=default)
+
+    loads = _orjson.loads
+else:
+    def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """Encode obj to compact JSON bytes."""
+        return _stdlib_json.dumps(obj, default=default, separators=(",", ":")).encode("utf-8")
+
+    loads = _stdlib_json.loads
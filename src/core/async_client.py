@@ -1,30 +1,146 @@
 import asyncio
+import os
 import aiohttp
-import json
 import time
-import uuid
+from collections import deque
 from typing import Dict, Any, Optional, AsyncGenerator, List
 
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional HTTP/2 transport
+    httpx = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional event loop speedup
+    uvloop = None
+
+from ._json import loads as _json_loads
 from .exceptions import (
     MCPError, MCPAuthError, MCPConnectionError, 
     MCPTimeoutError, MCPProtocolError, MCPExecutionError
 )
 from .models import (
-    ExecutionRequest, ExecutionResult, 
-    GenerationRequest, GenerationResult, 
+    ExecutionResult, GenerationResult, 
     StreamGenerationChunk, TokenUsage
 )
 from .protocols.mcp import (
-    build_request_message, parse_response_message,
+    build_request_message, parse_response_message, decode_stream_chunk,
+    encode_request_payload, decode_response_body, MSGPACK_AVAILABLE,
     MCPRequestType, MCPResponseType,
     CreateSessionInput, CodeExecutionInput, TextGenerationInput,
     TextGenerationMetadata
 )
 
 
+# Upper bound for one buffered SSE line; a frame this large means the
+# stream is corrupt, not a token chunk
+_MAX_SSE_LINE = 1 << 20
+
+
+class _RateLimiter:
+    """Proactive sliding-window request limiter.
+
+    The admission controller reacts to 429s; this limiter tries not to earn
+    them in the first place. A deque of monotonic timestamps tracks requests
+    in the last 60s and callers sleep before sending once the window is
+    full, and provider rate-limit headers can impose an explicit pause, so
+    round trips are not wasted on calls the server would reject.
+    """
+    __slots__ = ("rpm_limit", "_stamps", "_pause_until")
+
+    def __init__(self, rpm_limit: int = 300):
+        self.rpm_limit = rpm_limit
+        self._stamps = deque()
+        self._pause_until = 0.0
+
+    async def wait_if_throttled(self) -> None:
+        now = time.monotonic()
+        if self._pause_until > now:
+            await asyncio.sleep(self._pause_until - now)
+            now = time.monotonic()
+        stamps = self._stamps
+        while stamps and now - stamps[0] >= 60.0:
+            stamps.popleft()
+        if len(stamps) >= self.rpm_limit:
+            wait = stamps[0] + 60.0 - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            stamps.popleft()
+        stamps.append(time.monotonic())
+
+    def update_from_headers(self, headers) -> None:
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                self._pause_until = time.monotonic() + float(retry_after)
+            except ValueError:
+                pass
+            return
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        limit = headers.get("x-ratelimit-limit-requests")
+        if remaining is not None and limit is not None:
+            try:
+                # Nearly exhausted: back off briefly before the hard limit
+                if int(remaining) < int(limit) * 0.1:
+                    self._pause_until = time.monotonic() + 1.0
+            except ValueError:
+                pass
+
+
+class _AdmissionController:
+    """AIMD governor for the number of in-flight requests.
+
+    Retries alone make congestion worse: when the backend slows down or
+    starts returning 429s, every caller re-sends on its own schedule. This
+    controller caps concurrency with a semaphore and adapts the cap the way
+    TCP does — additive increase on success, multiplicative decrease on
+    throttling — so the client converges on a safe in-flight count instead
+    of hammering a struggling server.
+    """
+    __slots__ = ("limit", "min_limit", "max_limit", "_permits", "_debt", "_sem")
+
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 64):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._permits = initial
+        self._debt = 0  # permits to absorb instead of returning on release
+        self._sem = asyncio.Semaphore(initial)
+
+    async def acquire(self) -> None:
+        await self._sem.acquire()
+
+    def release(self) -> None:
+        if self._debt > 0:
+            self._debt -= 1
+        else:
+            self._sem.release()
+
+    def on_success(self) -> None:
+        """Additive increase: grow the window slowly while things are healthy."""
+        if self.limit < self.max_limit:
+            self.limit += 0.125
+            if int(self.limit) > self._permits:
+                self._permits += 1
+                self.release()
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease: halve the window on 429/load shedding."""
+        new_limit = max(self.min_limit, int(self.limit / 2))
+        shrink = self._permits - new_limit
+        if shrink > 0:
+            self._debt += shrink
+            self._permits = new_limit
+        self.limit = float(new_limit)
+
+
 class DeepExecAsyncClient:
     """Asynchronous client for interacting with the DeepExec service."""
 
+    # Optional process-wide session installed via set_shared_session()
+    _shared_session: Optional[aiohttp.ClientSession] = None
+
     def __init__(
         self,
         endpoint: str = "https://api.deepexec.com/v1",
@@ -34,6 +150,9 @@ class DeepExecAsyncClient:
         max_retries: int = 3,
         retry_delay: float = 1.0,
         verify_ssl: bool = True,
+        batch_window: Optional[float] = None,
+        max_batch: int = 16,
+        use_msgpack: bool = False,
     ):
         """Initialize the asynchronous DeepExec client.
 
@@ -56,9 +175,39 @@ class DeepExecAsyncClient:
         
         self.session = None
         self.session_id = None
+        # Guards lazy session creation: concurrent first calls previously
+        # raced to build two sessions and leaked one
+        self._session_lock = asyncio.Lock()
+        self._owns_session = True
+        self._request_headers = None
+        # AIMD admission control over concurrent requests
+        self._admission = _AdmissionController()
+        # Sliding-window limiter that pauses before the provider would 429
+        self._rate_limiter = _RateLimiter()
+        # ClientTimeout is immutable, so one instance per distinct value is
+        # enough; the default is prebuilt here and reused on every request
+        self._timeout_cache: Dict[float, aiohttp.ClientTimeout] = {
+            timeout: aiohttp.ClientTimeout(total=timeout)
+        }
+        # Optional HTTP/2 transport: multiplexes concurrent requests over one
+        # TLS connection. Opt-in via DEEPEXEC_HTTP2=1 when httpx is
+        # installed; streaming endpoints stay on aiohttp either way.
+        self._http2_client = None
+        self._use_http2 = httpx is not None and os.environ.get("DEEPEXEC_HTTP2") == "1"
+        # Opt-in request coalescing: when batch_window is set, generate_text
+        # calls queue up and a background worker posts them as one /batch
+        # request, amortizing RTT and framing across concurrent callers
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._gen_queue = None
+        self._batch_task = None
+        # Opt-in binary responses: advertise MessagePack in Accept and let
+        # decode_response_body branch on what the server actually sent.
+        # Requests stay JSON, so there is nothing to negotiate upfront.
+        self._use_msgpack = use_msgpack and MSGPACK_AVAILABLE
         self._headers = {
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/msgpack, application/json" if self._use_msgpack else "application/json"
         }
         
         if deepseek_key:
@@ -66,21 +215,98 @@ class DeepExecAsyncClient:
         if e2b_key:
             self._headers["X-E2B-Key"] = e2b_key
 
+    @classmethod
+    def set_shared_session(cls, session: Optional[aiohttp.ClientSession]) -> None:
+        """Install a process-wide ClientSession shared by all clients.
+
+        Apps that build many clients (one per tenant, say) otherwise pay
+        for one connection pool each. A single long-lived session shares
+        the DNS cache, TLS session resumption and a bounded FD budget;
+        create it once with a generously sized TCPConnector, e.g.
+        TCPConnector(limit=512, limit_per_host=64, keepalive_timeout=75),
+        and keep it open for the process lifetime. Clients never close a
+        shared session; pass None to go back to per-client sessions.
+
+        Args:
+            session: The session to share, or None to disable sharing.
+        """
+        cls._shared_session = session
+
+    @classmethod
+    def install_uvloop(cls) -> bool:
+        """Install uvloop as the asyncio event loop policy if available.
+
+        The client is purely I/O-bound, where libuv's C event loop gives
+        the largest wins. Call once before asyncio.run(); on Python 3.12+
+        asyncio.Runner(loop_factory=uvloop.new_event_loop) is an
+        alternative that avoids the global policy.
+
+        Returns:
+            True if uvloop was installed, False if it is not available
+            (not installed, or an unsupported platform such as Windows).
+        """
+        if uvloop is None:
+            return False
+        uvloop.install()
+        return True
+
     async def __aenter__(self):
         """Async context manager entry."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession(
-                headers=self._headers,
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            )
+        await self._ensure_session()
         return self
 
+    async def _ensure_session(self) -> None:
+        """Create the underlying HTTP session exactly once.
+
+        Double-checked under the session lock so concurrent first calls on
+        a fresh client cannot race and leak a second connector.
+        """
+        if self.session is None:
+            async with self._session_lock:
+                if self.session is None:
+                    shared = type(self)._shared_session
+                    if shared is not None and not shared.closed:
+                        # Borrow the process-wide session: auth headers are
+                        # applied per request since the pool is shared
+                        self.session = shared
+                        self._owns_session = False
+                        self._request_headers = self._headers
+                        if self._batch_window and self._batch_task is None:
+                            self._gen_queue = asyncio.Queue()
+                            self._batch_task = asyncio.create_task(self._batch_worker())
+                        return
+                    # One tuned connector for the client lifetime: keep-alive
+                    # connections skip the TCP+TLS handshake per request and
+                    # the DNS cache removes repeated getaddrinfo calls
+                    connector = aiohttp.TCPConnector(
+                        limit=256,
+                        limit_per_host=64,
+                        keepalive_timeout=75,
+                        ttl_dns_cache=300,
+                        ssl=self.verify_ssl,
+                    )
+                    self.session = aiohttp.ClientSession(
+                        headers=self._headers,
+                        timeout=aiohttp.ClientTimeout(total=self.timeout),
+                        connector=connector,
+                    )
+                    if self._use_http2 and self._http2_client is None:
+                        self._http2_client = httpx.AsyncClient(
+                            http2=True,
+                            headers=self._headers,
+                            timeout=self.timeout,
+                            limits=httpx.Limits(
+                                max_keepalive_connections=32,
+                                keepalive_expiry=75,
+                            ),
+                        )
+                    if self._batch_window and self._batch_task is None:
+                        self._gen_queue = asyncio.Queue()
+                        self._batch_task = asyncio.create_task(self._batch_worker())
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
-            await self.session.close()
-            self.session = None
-        self.session_id = None
+        await self.close()
 
     async def create_session(self, user_id: str) -> str:
         """Create a new session with the DeepExec service.
@@ -99,8 +325,7 @@ class DeepExecAsyncClient:
         if not self.deepseek_key or not self.e2b_key:
             raise MCPAuthError("Both DeepSeek and E2B API keys are required")
 
-        if self.session is None:
-            await self.__aenter__()
+        await self._ensure_session()
 
         request_data = build_request_message(
             type=MCPRequestType.CREATE_SESSION,
@@ -149,25 +374,20 @@ class DeepExecAsyncClient:
         if not self.session_id:
             raise MCPProtocolError("No active session. Call create_session() first.")
 
-        if not code.strip():
+        if not code or code.isspace():
             raise MCPProtocolError("Code cannot be empty")
 
-        # Validate the request using Pydantic model
-        request = ExecutionRequest(
-            code=code,
-            language=language,
-            environment=environment or {},
-            working_directory=working_directory or "/home/user"
-        )
-
+        # Validate once, directly into the protocol input model; the old
+        # ExecutionRequest round trip ran the same validators twice and
+        # allocated an extra model per call
         request_data = build_request_message(
             type=MCPRequestType.CODE_EXECUTION,
             session_id=self.session_id,
             input=CodeExecutionInput(
-                code=request.code,
-                language=request.language,
-                environment=request.environment,
-                working_directory=request.working_directory
+                code=code,
+                language=language,
+                environment=environment or {},
+                working_directory=working_directory or "/home/user"
             ),
             metadata={}
         )
@@ -202,6 +422,33 @@ class DeepExecAsyncClient:
                     pass
             raise
 
+    async def execute_many(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 16
+    ) -> List[ExecutionResult]:
+        """Execute several code snippets with bounded concurrency.
+
+        Prefer this over an unbounded ``asyncio.gather`` of execute_code
+        calls: the semaphore keeps at most ``concurrency`` requests in
+        flight, so the connection pool is reused instead of exhausted and
+        memory stays flat regardless of how many items are queued.
+
+        Args:
+            items: Keyword-argument dicts, one per execute_code call.
+            concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+            ExecutionResult objects in the same order as items.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(item: Dict[str, Any]) -> ExecutionResult:
+            async with semaphore:
+                return await self.execute_code(**item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
     async def generate_text(
         self,
         prompt: str,
@@ -230,36 +477,34 @@ class DeepExecAsyncClient:
         if not self.session_id:
             raise MCPProtocolError("No active session. Call create_session() first.")
 
-        if not prompt.strip():
+        if not prompt or prompt.isspace():
             raise MCPProtocolError("Prompt cannot be empty")
 
         # Validate the request using Pydantic model
-        request = GenerationRequest(
-            prompt=prompt,
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-
         request_data = build_request_message(
             type=MCPRequestType.TEXT_GENERATION,
             session_id=self.session_id,
             input=TextGenerationInput(
-                prompt=request.prompt,
-                max_tokens=request.max_tokens,
-                temperature=request.temperature
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
             ),
-            metadata=TextGenerationMetadata(model=request.model)
+            metadata=TextGenerationMetadata(model=model)
         )
 
         # Use the provided timeout if specified, otherwise use the client's default
         current_timeout = timeout or self.timeout
 
-        response = await self._send_request(
-            "generate",
-            request_data,
-            timeout=current_timeout
-        )
+        if self._batch_task is not None:
+            fut = asyncio.get_running_loop().create_future()
+            await self._gen_queue.put((request_data, fut))
+            response = await fut
+        else:
+            response = await self._send_request(
+                "generate",
+                request_data,
+                timeout=current_timeout
+            )
 
         # Parse the generation result
         result = GenerationResult(
@@ -274,6 +519,28 @@ class DeepExecAsyncClient:
         )
         return result
 
+    async def generate_many(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 16
+    ) -> List[GenerationResult]:
+        """Generate text for several prompts with bounded concurrency.
+
+        Args:
+            items: Keyword-argument dicts, one per generate_text call.
+            concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+            GenerationResult objects in the same order as items.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(item: Dict[str, Any]) -> GenerationResult:
+            async with semaphore:
+                return await self.generate_text(**item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
     async def stream_generate_text(
         self,
         prompt: str,
@@ -299,55 +566,103 @@ class DeepExecAsyncClient:
         if not self.session_id:
             raise MCPProtocolError("No active session. Call create_session() first.")
 
-        if not prompt.strip():
+        if not prompt or prompt.isspace():
             raise MCPProtocolError("Prompt cannot be empty")
 
         # Validate the request using Pydantic model
-        request = GenerationRequest(
-            prompt=prompt,
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-
         request_data = build_request_message(
             type=MCPRequestType.TEXT_GENERATION_STREAM,
             session_id=self.session_id,
             input=TextGenerationInput(
-                prompt=request.prompt,
-                max_tokens=request.max_tokens,
-                temperature=request.temperature
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
             ),
-            metadata=TextGenerationMetadata(model=request.model)
+            metadata=TextGenerationMetadata(model=model)
         )
 
-        if self.session is None:
-            await self.__aenter__()
+        await self._ensure_session()
 
         url = f"{self.endpoint}/generate/stream"
 
         try:
-            async with self.session.post(url, json=request_data) as response:
+            async with self.session.post(url, data=encode_request_payload(request_data), headers=self._request_headers) as response:
                 if response.status != 200:
-                    error_text = await response.text()
-                    self._handle_error_response(response.status, error_text)
-
-                # Process the streaming response
-                async for line in response.content.iter_lines():
-                    if line:
-                        line = line.decode('utf-8')
-                        if line.startswith('data: '):
-                            data = json.loads(line[6:])  # Remove 'data: ' prefix
-                            yield {
-                                "text": data.get("text", ""),
-                                "done": data.get("done", False)
-                            }
+                    self._handle_error_response(response.status, await response.read())
+
+                # Process the streaming response with a byte-level line
+                # splitter: frames never leave bytes until the JSON decode,
+                # and iter_any avoids readline's per-call buffering
+                buf = bytearray()
+                async for data in response.content.iter_any():
+                    buf += data
+                    while True:
+                        nl = buf.find(b"\n")
+                        if nl == -1:
+                            break
+                        line = bytes(buf[:nl])
+                        del buf[:nl + 1]
+                        if line.startswith(b'data: '):
+                            yield decode_stream_chunk(line[6:])  # Remove 'data: ' prefix
+                    if len(buf) > _MAX_SSE_LINE:
+                        raise MCPProtocolError("SSE frame exceeds maximum line length")
 
         except asyncio.TimeoutError:
             raise MCPTimeoutError(f"Request timed out after {self.timeout} seconds")
         except aiohttp.ClientError as e:
             raise MCPConnectionError(f"Connection error: {str(e)}")
 
+
+    async def _batch_worker(self) -> None:
+        """Coalesce queued generation requests into single batch posts.
+
+        Waits for the first queued item, then drains up to max_batch more
+        within the batch window before posting them as one request, so the
+        window bounds added latency while bursts share a single round trip.
+        """
+        while True:
+            item = await self._gen_queue.get()
+            items = [item]
+            try:
+                deadline = time.monotonic() + self._batch_window
+                while len(items) < self._max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(self._gen_queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+                response = await self._send_request(
+                    "generate/batch",
+                    {"requests": [request_data for request_data, _ in items]}
+                )
+                results = response.get("results", [])
+                for (_, fut), result in zip(items, results):
+                    if fut.done():
+                        continue
+                    # Each batch entry is a wire frame; run it through the
+                    # same parsing as the direct path so callers see the
+                    # client shape, and error frames raise per item
+                    try:
+                        fut.set_result(parse_response_message(result))
+                    except Exception as e:
+                        fut.set_exception(e)
+                for _, fut in items[len(results):]:
+                    if not fut.done():
+                        fut.set_exception(MCPProtocolError("Batch response missing results"))
+            except asyncio.CancelledError:
+                # The worker is cancelled by close(); fail the in-flight
+                # batch so no caller is left awaiting a dead future
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(MCPConnectionError("Client closed"))
+                raise
+            except Exception as e:
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+
     async def _send_request(
         self,
         endpoint_path: str,
@@ -370,31 +685,77 @@ class DeepExecAsyncClient:
             MCPTimeoutError: If the request times out.
             MCPProtocolError: If there's an issue with the protocol.
         """
-        if self.session is None:
-            await self.__aenter__()
+        await self._ensure_session()
 
         url = f"{self.endpoint}/{endpoint_path}"
         current_timeout = timeout or self.timeout
 
-        # Add request ID if not present
+        # Add request ID if not present. os.urandom(16).hex() gives the same
+        # 128 bits of entropy as uuid4 without the UUID object, version-byte
+        # munging, or hyphen formatting; on Linux it is a lock-free getrandom
         if "request_id" not in data:
-            data["request_id"] = str(uuid.uuid4())
+            data["request_id"] = os.urandom(16).hex()
+
+        # Encode once, outside the retry loop. encode_request_payload splices
+        # the pre-serialized protocol header and knows how to serialize the
+        # pydantic input models embedded in the envelope
+        payload = encode_request_payload(data)
+
+        timeout_obj = self._timeout_cache.get(current_timeout)
+        if timeout_obj is None:
+            timeout_obj = self._timeout_cache.setdefault(
+                current_timeout, aiohttp.ClientTimeout(total=current_timeout)
+            )
 
         retries = 0
         last_error = None
 
         while retries <= self.max_retries:
+            retry_after = None
             try:
-                # Set a timeout for this specific request
-                timeout_obj = aiohttp.ClientTimeout(total=current_timeout)
-                
-                async with self.session.post(url, json=data, timeout=timeout_obj) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        return parse_response_message(response_data)
+                await self._rate_limiter.wait_if_throttled()
+                await self._admission.acquire()
+                try:
+                    if self._http2_client is not None:
+                        try:
+                            h2_response = await self._http2_client.post(
+                                url, content=payload, timeout=current_timeout
+                            )
+                        except httpx.TimeoutException:
+                            raise asyncio.TimeoutError()
+                        except httpx.HTTPError as e:
+                            raise MCPConnectionError(f"Connection error: {str(e)}")
+                        self._rate_limiter.update_from_headers(h2_response.headers)
+                        if h2_response.status_code == 200:
+                            raw = h2_response.content
+                            self._admission.on_success()
+                            return decode_response_body(
+                                raw,
+                                h2_response.headers.get("content-type", "").split(";")[0],
+                            )
+                        elif h2_response.status_code == 429:
+                            self._admission.on_throttle()
+                            retry_after = h2_response.headers.get("Retry-After")
+                            last_error = MCPConnectionError("Rate limited by server (429)")
+                        else:
+                            self._handle_error_response(h2_response.status_code, h2_response.content)
                     else:
-                        error_text = await response.text()
-                        self._handle_error_response(response.status, error_text)
+                        async with self.session.post(url, data=payload, timeout=timeout_obj, headers=self._request_headers) as response:
+                            self._rate_limiter.update_from_headers(response.headers)
+                            if response.status == 200:
+                                raw = await response.read()
+                                self._admission.on_success()
+                                return decode_response_body(raw, response.content_type)
+                            elif response.status == 429:
+                                # Throttled: shrink the window and honor the
+                                # server's Retry-After instead of our own backoff
+                                self._admission.on_throttle()
+                                retry_after = response.headers.get("Retry-After")
+                                last_error = MCPConnectionError("Rate limited by server (429)")
+                            else:
+                                self._handle_error_response(response.status, await response.read())
+                finally:
+                    self._admission.release()
 
             except asyncio.TimeoutError:
                 last_error = MCPTimeoutError(f"Request timed out after {current_timeout} seconds")
@@ -409,8 +770,14 @@ class DeepExecAsyncClient:
             # Increment retry counter and delay before retrying
             retries += 1
             if retries <= self.max_retries:
-                # Exponential backoff with jitter
-                delay = self.retry_delay * (2 ** (retries - 1)) * (0.5 + 0.5 * (time.time() % 1))
+                if retry_after is not None:
+                    try:
+                        delay = float(retry_after)
+                    except ValueError:
+                        delay = self.retry_delay
+                else:
+                    # Exponential backoff with jitter
+                    delay = self.retry_delay * (2 ** (retries - 1)) * (0.5 + 0.5 * (time.time() % 1))
                 await asyncio.sleep(delay)
 
         # If we've exhausted all retries, raise the last error
@@ -419,26 +786,30 @@ class DeepExecAsyncClient:
         else:
             raise MCPConnectionError("Failed to connect to the server after multiple retries")
 
-    def _handle_error_response(self, status_code: int, error_text: str) -> None:
+    def _handle_error_response(self, status_code: int, error_body) -> None:
         """Handle error responses from the server.
 
         Args:
             status_code: The HTTP status code.
-            error_text: The error response text.
+            error_body: The raw error response body (bytes or str).
 
         Raises:
             MCPAuthError: If authentication fails (401, 403).
             MCPConnectionError: If there's a server error (5xx).
             MCPProtocolError: For other error responses.
         """
-        error_data = {}
         try:
-            error_data = json.loads(error_text)
-        except json.JSONDecodeError:
+            # Both decoders accept bytes, so the body is parsed as read off
+            # the wire and the UTF-8 str decode only happens for non-JSON
+            # bodies (this matters under 429/5xx storms)
+            error_data = _json_loads(error_body)
+        except ValueError:
             # If not JSON, use the raw text
-            error_message = error_text
+            error_message = error_body.decode("utf-8", "replace") if isinstance(error_body, bytes) else error_body
         else:
-            error_message = error_data.get("error", {}).get("message", error_text)
+            error_message = error_data.get("error", {}).get("message")
+            if error_message is None:
+                error_message = error_body.decode("utf-8", "replace") if isinstance(error_body, bytes) else error_body
 
         if status_code == 401 or status_code == 403:
             raise MCPAuthError(f"Authentication error: {error_message}")
@@ -459,8 +830,7 @@ class DeepExecAsyncClient:
             MCPConnectionError: If connection to the server fails.
             MCPProtocolError: If there's an issue with the protocol.
         """
-        if self.session is None:
-            await self.__aenter__()
+        await self._ensure_session()
 
         request_data = build_request_message(
             type=MCPRequestType.CANCEL_EXECUTION,
@@ -472,7 +842,7 @@ class DeepExecAsyncClient:
         url = f"{self.endpoint}/cancel"
 
         try:
-            async with self.session.post(url, json=request_data) as response:
+            async with self.session.post(url, data=encode_request_payload(request_data), headers=self._request_headers) as response:
                 if response.status != 200:
                     # Just log the error, don't raise
                     pass
@@ -481,5 +851,29 @@ class DeepExecAsyncClient:
             pass
 
     async def close(self) -> None:
-        """Close the client connection."""
-        await self.__aexit__(None, None, None)
+        """Close the client connection. Safe to call more than once."""
+        async with self._session_lock:
+            if self._batch_task is not None:
+                self._batch_task.cancel()
+                try:
+                    await self._batch_task
+                except asyncio.CancelledError:
+                    pass
+                self._batch_task = None
+                # Fail anything still queued behind the in-flight batch so
+                # concurrent generate_text callers are not left hanging
+                while not self._gen_queue.empty():
+                    _, fut = self._gen_queue.get_nowait()
+                    if not fut.done():
+                        fut.set_exception(MCPConnectionError("Client closed"))
+                self._gen_queue = None
+            if self.session is not None:
+                # Never close a borrowed shared session; it outlives any
+                # one client
+                if self._owns_session:
+                    await self.session.close()
+                self.session = None
+            if self._http2_client is not None:
+                await self._http2_client.aclose()
+                self._http2_client = None
+            self.session_id = None
@@ -1,5 +1,21 @@
 from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field, validator
+
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field, validator
+from pydantic.alias_generators import to_camel
+
+# Shared config for models whose wire format uses camelCase aliases. A single
+# alias generator lets pydantic-core reuse one schema template instead of
+# building per-field aliased validators.
+_CAMEL_CASE_CONFIG = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+# Allow-list for code languages, precompiled at import time: validation is a
+# single hash lookup and the error message is joined once, not per call.
+_VALID_LANGUAGES = frozenset({
+    "python", "javascript", "typescript", "java", "c", "cpp", "csharp",
+    "go", "rust", "ruby", "php", "bash", "powershell"
+})
+_VALID_LANGUAGES_MSG = ", ".join(sorted(_VALID_LANGUAGES))
 
 
 class ExecutionRequest(BaseModel):
@@ -11,39 +27,39 @@ class ExecutionRequest(BaseModel):
 
     @validator('code')
     def code_must_not_be_empty(cls, v):
-        if not v.strip():
+        if not v or v.isspace():
             raise ValueError('Code cannot be empty')
         return v
 
     @validator('language')
     def language_must_be_valid(cls, v):
         # This is a basic validation that can be extended with a list of supported languages
-        valid_languages = [
-            "python", "javascript", "typescript", "java", "c", "cpp", "csharp", 
-            "go", "rust", "ruby", "php", "bash", "powershell"
-        ]
-        if v.lower() not in valid_languages:
-            raise ValueError(f"Unsupported language: {v}. Supported languages: {', '.join(valid_languages)}")
+        if v.lower() not in _VALID_LANGUAGES:
+            raise ValueError(f"Unsupported language: {v}. Supported languages: {_VALID_LANGUAGES_MSG}")
         return v.lower()
 
 
-class ExecutionResult(BaseModel):
-    """Model for code execution results."""
+class ExecutionResult(msgspec.Struct, frozen=True):
+    """Model for code execution results.
+
+    A msgspec.Struct rather than a pydantic model: execution results come
+    from responses we already trust, so a slotted C-level container is
+    enough and the validation cost is skipped.
+    """
     output: str
     exit_code: int
     execution_time: int  # in milliseconds
     memory_usage: int  # in MB
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
 
 
 class TokenUsage(BaseModel):
     """Model for token usage statistics."""
-    prompt_tokens: int = Field(0, alias="promptTokens")
-    completion_tokens: int = Field(0, alias="completionTokens")
-    total_tokens: int = Field(0, alias="totalTokens")
+    model_config = _CAMEL_CASE_CONFIG
 
-    class Config:
-        allow_population_by_field_name = True
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
 
 
 class GenerationRequest(BaseModel):
@@ -55,7 +71,7 @@ class GenerationRequest(BaseModel):
 
     @validator('prompt')
     def prompt_must_not_be_empty(cls, v):
-        if not v.strip():
+        if not v or v.isspace():
             raise ValueError('Prompt cannot be empty')
         return v
 
@@ -74,41 +90,89 @@ class GenerationRequest(BaseModel):
 
 class GenerationResult(BaseModel):
     """Model for text generation results."""
+    model_config = _CAMEL_CASE_CONFIG
+
     text: str
     model: str
-    generation_time: int = Field(0, alias="generationTime")  # in milliseconds
+    generation_time: int = 0  # in milliseconds
     usage: TokenUsage
 
-    class Config:
-        allow_population_by_field_name = True
 
-
-class StreamGenerationChunk(BaseModel):
+class StreamGenerationChunk(msgspec.Struct, frozen=True):
     """Model for streaming text generation chunks."""
     text: str
     done: bool
 
 
-class SecurityOptions(BaseModel):
-    """Model for security configuration options."""
-    max_code_length: int = Field(10000, alias="maxCodeLength")
-    allowed_languages: List[str] = Field(default_factory=list, alias="allowedLanguages")
-    blocked_keywords: List[str] = Field(default_factory=list, alias="blockedKeywords")
-
-    class Config:
-        allow_population_by_field_name = True
-
-
-class ClientConfig(BaseModel):
-    """Model for client configuration."""
-    endpoint: str = "https://api.deepexec.com/v1"
-    timeout: float = 30.0
-    max_retries: int = Field(3, alias="maxRetries")
-    retry_delay: float = Field(1.0, alias="retryDelay")
-    verify_ssl: bool = Field(True, alias="verifySSL")
-    deepseek_key: Optional[str] = Field(None, alias="deepseekKey")
-    e2b_key: Optional[str] = Field(None, alias="e2bKey")
-    security_options: SecurityOptions = Field(default_factory=SecurityOptions, alias="securityOptions")
-
-    class Config:
-        allow_population_by_field_name = True
+class SecurityOptions:
+    """Model for security configuration options.
+
+    A plain __slots__ class rather than a pydantic model: these are internal
+    configuration containers built from keyword arguments in our own code, so
+    schema compilation and per-instance __dict__/__fields_set__ bookkeeping
+    bought nothing. Wire-format aliasing lives in to_dict().
+    """
+    __slots__ = ("max_code_length", "allowed_languages", "blocked_keywords")
+
+    def __init__(
+        self,
+        max_code_length: int = 10000,
+        allowed_languages: Optional[List[str]] = None,
+        blocked_keywords: Optional[List[str]] = None,
+    ) -> None:
+        self.max_code_length = max_code_length
+        self.allowed_languages = allowed_languages if allowed_languages is not None else []
+        self.blocked_keywords = blocked_keywords if blocked_keywords is not None else []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the camelCase wire form."""
+        return {
+            "maxCodeLength": self.max_code_length,
+            "allowedLanguages": self.allowed_languages,
+            "blockedKeywords": self.blocked_keywords,
+        }
+
+
+class ClientConfig:
+    """Model for client configuration.
+
+    Same rationale as SecurityOptions: a slotted container with defaults,
+    not a validated model.
+    """
+    __slots__ = (
+        "endpoint", "timeout", "max_retries", "retry_delay",
+        "verify_ssl", "deepseek_key", "e2b_key", "security_options",
+    )
+
+    def __init__(
+        self,
+        endpoint: str = "https://api.deepexec.com/v1",
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        verify_ssl: bool = True,
+        deepseek_key: Optional[str] = None,
+        e2b_key: Optional[str] = None,
+        security_options: Optional[SecurityOptions] = None,
+    ) -> None:
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.verify_ssl = verify_ssl
+        self.deepseek_key = deepseek_key
+        self.e2b_key = e2b_key
+        self.security_options = security_options if security_options is not None else SecurityOptions()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the camelCase wire form (verifySSL kept verbatim)."""
+        return {
+            "endpoint": self.endpoint,
+            "timeout": self.timeout,
+            "maxRetries": self.max_retries,
+            "retryDelay": self.retry_delay,
+            "verifySSL": self.verify_ssl,
+            "deepseekKey": self.deepseek_key,
+            "e2bKey": self.e2b_key,
+            "securityOptions": self.security_options.to_dict(),
+        }
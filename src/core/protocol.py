@@ -4,6 +4,10 @@ This module is maintained for backward compatibility and redirects to the new
 implementation in protocols/mcp.py.
 """
 
+import string
+from functools import lru_cache
+
+from .exceptions import MCPProtocolError
 from .protocols.mcp import (
     PROTOCOL_VERSION,
     SUPPORTED_VERSIONS,
@@ -11,6 +15,17 @@ from .protocols.mcp import (
     parse_response_message,
 )
 
+# Every byte a session ID may contain. bytes.translate with this as the
+# deletion set leaves only invalid bytes behind, so the check is a single
+# C-level pass over the encoded ID with no per-character Python work (and
+# no regex state machine).
+_SID_ALLOWED = (string.ascii_letters + string.digits + "_-").encode("ascii")
+
+
+# Formatted only after the unsupported-version branch is taken, so the
+# fast path never builds the message string.
+_UNSUPPORTED_VERSION_MSG = "Unsupported protocol version: %s"
+
 
 def validate_protocol_version(version: str) -> bool:
     """Validate that the protocol version is supported.
@@ -19,14 +34,24 @@ def validate_protocol_version(version: str) -> bool:
         version: The protocol version to validate.
 
     Returns:
-        True if the version is supported, False otherwise.
+        True if the version is supported.
+
+    Raises:
+        MCPProtocolError: If the version is not supported.
     """
-    return version in SUPPORTED_VERSIONS
+    if version not in SUPPORTED_VERSIONS:
+        raise MCPProtocolError(_UNSUPPORTED_VERSION_MSG % version)
+    return True
 
 
+@lru_cache(maxsize=1024)
 def validate_session_id(session_id: str) -> bool:
     """Validate that the session ID is properly formatted.
 
+    Results for valid IDs are memoized: session IDs repeat for the lifetime
+    of a connection, so re-validating the same ID is a single cache lookup.
+    Failures raise and are deliberately not cached.
+
     Args:
         session_id: The session ID to validate.
 
@@ -36,15 +61,16 @@ def validate_session_id(session_id: str) -> bool:
     Raises:
         MCPProtocolError: If the session ID is invalid.
     """
-    import re
-    from .exceptions import MCPProtocolError
-    
     # Session ID should be at least 8 characters and contain only alphanumeric characters,
     # underscores, and hyphens
     if not session_id or len(session_id) < 8:
         raise MCPProtocolError("Invalid session ID: too short")
-    
-    if not re.match(r'^[a-zA-Z0-9_-]+$', session_id):
+
+    try:
+        invalid = session_id.encode("ascii").translate(None, _SID_ALLOWED)
+    except UnicodeEncodeError:
+        invalid = True
+    if invalid:
         raise MCPProtocolError("Invalid session ID: contains invalid characters")
-    
+
     return True
@@ -5,6 +5,15 @@ including the MCP (Model Communication Protocol) used for communication with
 the DeepExec service.
 """
 
-from . import mcp
-
 __all__ = ["mcp"]
+
+
+def __getattr__(name):
+    # PEP 562 lazy import: callers that never touch the MCP entrypoints
+    # skip loading the submodule (and its pydantic model compilation)
+    # entirely; `from .protocols.mcp import ...` bypasses this and still
+    # imports the submodule directly.
+    if name == "mcp":
+        import importlib
+        return importlib.import_module(".mcp", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,13 +5,48 @@ Pydantic models for requests and responses, and utility functions for
 working with the protocol.
 """
 
+import json
+import sys
+import types
 from enum import Enum
-from typing import Dict, Any, List, Optional, Union
-from pydantic import BaseModel, Field, validator, root_validator
+from typing import Dict, Any, Literal, Mapping, Optional, Union
+from typing_extensions import NotRequired, TypedDict
+from pydantic import BaseModel, ConfigDict, Field, validator, root_validator
+
+from ..exceptions import MCPProtocolError
+from .._json import dumps as _json_dumps, loads as _json_loads
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None
 
 # Protocol version constants
 PROTOCOL_VERSION = "2024.1"
-SUPPORTED_VERSIONS = ["2024.1"]
+SUPPORTED_VERSIONS = frozenset({"2024.1"})
+
+# Shared immutable default for request payload fields. Reusing one sentinel
+# avoids allocating two fresh dicts per request; anything that needs to
+# mutate input/metadata must copy first.
+_EMPTY: Mapping[str, Any] = types.MappingProxyType({})
+
+# Interned status values: JSON decoders that intern short keys/values let
+# the status check below succeed on a pointer compare before falling back
+# to a full string compare.
+_ERROR = sys.intern("error")
+_SUCCESS = sys.intern("success")
+
+# Language allow-list, precompiled once: membership is a hash lookup and the
+# error message join happens at import, not per validation.
+_VALID_LANGUAGES = frozenset({
+    "python", "javascript", "typescript", "java", "c", "cpp", "csharp",
+    "go", "rust", "ruby", "php", "bash", "powershell"
+})
+_VALID_LANGUAGES_MSG = ", ".join(sorted(_VALID_LANGUAGES))
+
+# Shared config for read-only response models; one dict referenced by each
+# model instead of a fresh ConfigDict per class.
+_FROZEN_CONFIG = ConfigDict(frozen=True)
 
 
 class MCPRequestType(str, Enum):
@@ -51,23 +86,21 @@ class MCPErrorCode(str, Enum):
 
 # Base models for requests and responses
 class MCPBaseMessage(BaseModel):
-    """Base model for all MCP messages."""
-    protocol_version: str = PROTOCOL_VERSION
-
-    @validator('protocol_version')
-    def validate_protocol_version(cls, v):
-        """Validate that the protocol version is supported."""
-        if v not in SUPPORTED_VERSIONS:
-            raise ValueError(f"Unsupported protocol version: {v}")
-        return v
+    """Base model for all MCP messages.
+
+    The protocol version is constrained with a Literal type so pydantic-core
+    enforces it during field validation; no per-instance Python validator
+    needs to run for the (near universal) default value.
+    """
+    protocol_version: Literal["2024.1"] = PROTOCOL_VERSION
 
 
 class MCPRequestBase(MCPBaseMessage):
     """Base model for all MCP requests."""
     type: str
     session_id: Optional[str] = None
-    input: Dict[str, Any] = Field(default_factory=dict)
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    input: Mapping[str, Any] = Field(default_factory=lambda: _EMPTY)
+    metadata: Mapping[str, Any] = Field(default_factory=lambda: _EMPTY)
     request_id: Optional[str] = None
 
 
@@ -75,19 +108,28 @@ class MCPResponseBase(MCPBaseMessage):
     """Base model for all MCP responses."""
     type: str
     session_id: Optional[str] = None
-    status: MCPStatus = MCPStatus.SUCCESS
+    status: Literal["success", "error"] = "success"
 
 
 class MCPErrorDetail(BaseModel):
     """Model for MCP error details."""
-    code: MCPErrorCode = MCPErrorCode.UNKNOWN_ERROR
+    model_config = _FROZEN_CONFIG
+
+    code: Literal[
+        "invalid_request", "authentication_error", "rate_limit_exceeded",
+        "execution_error", "generation_error", "timeout_error",
+        "server_error", "unknown_error"
+    ] = "unknown_error"
     message: str
-    details: Dict[str, Any] = Field(default_factory=dict)
+    # Passed through as-is; error details are opaque blobs the client never
+    # introspects, so per-key validation on every error would be dead work
+    details: Any = Field(default_factory=dict)
 
 
 class MCPErrorResponse(MCPResponseBase):
     """Model for MCP error responses."""
-    status: MCPStatus = MCPStatus.ERROR
+    type: Literal["error"] = "error"
+    status: Literal["error"] = "error"
     error: MCPErrorDetail
 
 
@@ -99,13 +141,15 @@ class CreateSessionInput(BaseModel):
 
 class CreateSessionRequest(MCPRequestBase):
     """Request model for session creation."""
-    type: str = MCPRequestType.CREATE_SESSION
+    type: Literal["create_session"] = "create_session"
     input: CreateSessionInput
 
 
 class SessionCreatedResponse(MCPResponseBase):
     """Response model for session creation."""
-    type: str = MCPResponseType.SESSION_CREATED
+    model_config = _FROZEN_CONFIG
+
+    type: Literal["session_created"] = "session_created"
     session_id: str
 
 
@@ -119,73 +163,64 @@ class CodeExecutionInput(BaseModel):
 
     @validator('code')
     def code_must_not_be_empty(cls, v):
-        if not v.strip():
+        if not v or v.isspace():
             raise ValueError('Code cannot be empty')
         return v
 
     @validator('language')
     def language_must_be_valid(cls, v):
-        valid_languages = [
-            "python", "javascript", "typescript", "java", "c", "cpp", "csharp", 
-            "go", "rust", "ruby", "php", "bash", "powershell"
-        ]
-        if v.lower() not in valid_languages:
-            raise ValueError(f"Unsupported language: {v}. Supported languages: {', '.join(valid_languages)}")
+        if v.lower() not in _VALID_LANGUAGES:
+            raise ValueError(f"Unsupported language: {v}. Supported languages: {_VALID_LANGUAGES_MSG}")
         return v.lower()
 
 
 class CodeExecutionRequest(MCPRequestBase):
     """Request model for code execution."""
-    type: str = MCPRequestType.CODE_EXECUTION
+    type: Literal["code_execution"] = "code_execution"
     session_id: str
     input: CodeExecutionInput
 
 
-class ExecutionResultOutput(BaseModel):
-    """Model for execution result output."""
-    output: str
-    exit_code: int = 0
-    execution_time: int = 0  # in milliseconds
-    memory_usage: int = 0  # in MB
-
+class ExecutionResultOutput(TypedDict):
+    """Wire shape for execution result output.
 
-class CodeExecutionOutput(BaseModel):
-    """Output model for code execution."""
-    execution_result: ExecutionResultOutput
+    A TypedDict rather than a nested BaseModel: the payload is only ever
+    produced by already-validated responses, so pydantic validates the keys
+    at the parent boundary without building intermediate model instances.
+    """
+    output: str
+    exit_code: NotRequired[int]
+    execution_time: NotRequired[int]  # in milliseconds
+    memory_usage: NotRequired[int]  # in MB
 
 
 class CodeExecutionResultResponse(MCPResponseBase):
-    """Response model for code execution."""
-    type: str = MCPResponseType.CODE_EXECUTION_RESULT
+    """Response model for code execution.
+
+    The output is the execution result itself; the former single-field
+    CodeExecutionOutput wrapper added one validation level and one lookup
+    per response without carrying any information.
+    """
+    type: Literal["code_execution_result"] = "code_execution_result"
     session_id: str
-    output: CodeExecutionOutput
+    output: ExecutionResultOutput
 
 
 # Text generation models
 class TextGenerationInput(BaseModel):
     """Input model for text generation."""
     prompt: str
-    max_tokens: int = 1000
-    temperature: float = 0.7
+    # Range checks as Field constraints run inside pydantic-core instead of
+    # calling back into Python per instance
+    max_tokens: int = Field(1000, gt=0)
+    temperature: float = Field(0.7, ge=0.0, le=1.0)
 
     @validator('prompt')
     def prompt_must_not_be_empty(cls, v):
-        if not v.strip():
+        if not v or v.isspace():
             raise ValueError('Prompt cannot be empty')
         return v
 
-    @validator('temperature')
-    def temperature_must_be_valid(cls, v):
-        if not 0.0 <= v <= 1.0:
-            raise ValueError('Temperature must be between 0.0 and 1.0')
-        return v
-
-    @validator('max_tokens')
-    def max_tokens_must_be_positive(cls, v):
-        if v <= 0:
-            raise ValueError('max_tokens must be positive')
-        return v
-
 
 class TextGenerationMetadata(BaseModel):
     """Metadata model for text generation."""
@@ -194,7 +229,7 @@ class TextGenerationMetadata(BaseModel):
 
 class TextGenerationRequest(MCPRequestBase):
     """Request model for text generation."""
-    type: str = MCPRequestType.TEXT_GENERATION
+    type: Literal["text_generation"] = "text_generation"
     session_id: str
     input: TextGenerationInput
     metadata: TextGenerationMetadata
@@ -202,17 +237,17 @@ class TextGenerationRequest(MCPRequestBase):
 
 class TextGenerationStreamRequest(MCPRequestBase):
     """Request model for streaming text generation."""
-    type: str = MCPRequestType.TEXT_GENERATION_STREAM
+    type: Literal["text_generation_stream"] = "text_generation_stream"
     session_id: str
     input: TextGenerationInput
     metadata: TextGenerationMetadata
 
 
-class TokenUsage(BaseModel):
-    """Model for token usage statistics."""
-    prompt_tokens: int = 0
-    completion_tokens: int = 0
-    total_tokens: int = 0
+class TokenUsage(TypedDict, total=False):
+    """Wire shape for token usage statistics."""
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
 
 
 class TextGenerationOutput(BaseModel):
@@ -220,41 +255,259 @@ class TextGenerationOutput(BaseModel):
     text: str
 
 
-class TextGenerationResultMetadata(BaseModel):
-    """Metadata model for text generation result."""
+class TextGenerationResultMetadata(TypedDict):
+    """Wire shape for text generation result metadata."""
     model: str
-    generation_time: int = 0  # in milliseconds
+    generation_time: NotRequired[int]  # in milliseconds
     usage: TokenUsage
 
 
 class TextGenerationResultResponse(MCPResponseBase):
     """Response model for text generation."""
-    type: str = MCPResponseType.TEXT_GENERATION_RESULT
+    type: Literal["text_generation_result"] = "text_generation_result"
     session_id: str
     output: TextGenerationOutput
     metadata: TextGenerationResultMetadata
 
 
-class TextGenerationStreamChunk(BaseModel):
-    """Model for streaming text generation chunks."""
+class TextGenerationStreamChunk(TypedDict):
+    """Wire shape for streaming text generation chunks."""
     text: str
-    done: bool = False
+    done: NotRequired[bool]
+
+
+if msgspec is not None:
+    class _StreamChunkShape(TypedDict, total=False):
+        """msgspec decoding target for SSE stream frames.
+
+        Decoding straight into the TypedDict builds the chunk dict in one
+        C pass; total=False keeps tolerance for frames that omit a key.
+        """
+        text: str
+        done: bool
+
+    _STREAM_CHUNK_DECODER = msgspec.json.Decoder(_StreamChunkShape)
+else:
+    _STREAM_CHUNK_DECODER = None
+
+
+def decode_stream_chunk(frame: bytes) -> TextGenerationStreamChunk:
+    """Decode one SSE data frame into a TextGenerationStreamChunk.
+
+    Streaming emits one chunk per token, so this is the hottest decode in
+    the SDK. With msgspec installed the frame is parsed and validated in a
+    single C pass with no intermediate dict; otherwise stdlib json is used.
+
+    Args:
+        frame: The JSON payload of an SSE data line (without the "data: "
+            prefix).
+
+    Returns:
+        The decoded chunk with "text" and "done" keys.
+    """
+    if _STREAM_CHUNK_DECODER is not None:
+        chunk = _STREAM_CHUNK_DECODER.decode(frame)
+        if "text" not in chunk:
+            chunk["text"] = ""
+        if "done" not in chunk:
+            chunk["done"] = False
+        return chunk
+    data = json.loads(frame)
+    return {"text": data.get("text", ""), "done": data.get("done", False)}
 
 
 # Cancel execution models
 class CancelExecutionRequest(MCPRequestBase):
     """Request model for canceling execution."""
-    type: str = MCPRequestType.CANCEL_EXECUTION
+    type: Literal["cancel_execution"] = "cancel_execution"
     session_id: str
 
 
 class ExecutionCanceledResponse(MCPResponseBase):
     """Response model for execution cancellation."""
-    type: str = MCPResponseType.EXECUTION_CANCELED
+    model_config = _FROZEN_CONFIG
+
+    type: Literal["execution_canceled"] = "execution_canceled"
     session_id: str
 
 
 # Utility functions for working with the protocol
+def _parse_code_execution_result(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse a code execution result response into the client result shape."""
+    try:
+        output = response["output"]["execution_result"]
+    except (KeyError, TypeError):
+        # TypeError covers an explicit null output on the wire
+        output = _EMPTY
+    return {
+        "output": output.get("output", ""),
+        "exitCode": output.get("exit_code", 1),
+        "executionTime": output.get("execution_time", 0),
+        "memoryUsage": output.get("memory_usage", 0),
+        "metadata": response.get("metadata", {})
+    }
+
+
+def _parse_text_generation_result(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse a text generation result response into the client result shape."""
+    output = response.get("output") or _EMPTY
+    metadata = response.get("metadata") or _EMPTY
+    usage = metadata.get("usage") or _EMPTY
+
+    return {
+        "text": output.get("text", ""),
+        "model": metadata.get("model", "unknown"),
+        "generationTime": metadata.get("generation_time", 0),
+        "usage": {
+            "promptTokens": usage.get("prompt_tokens", 0),
+            "completionTokens": usage.get("completion_tokens", 0),
+            "totalTokens": usage.get("total_tokens", 0)
+        }
+    }
+
+
+def _parse_session_created(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse a session created response into the client result shape."""
+    return {
+        "session_id": response.get("session_id", "")
+    }
+
+
+# Precomputed dispatch table for parse_response_message. Keyed by the raw
+# wire strings so dispatch is a single str hash lookup with no enum
+# attribute loads; the keys mirror MCPResponseType.
+_PARSERS = {
+    "code_execution_result": _parse_code_execution_result,
+    "text_generation_result": _parse_text_generation_result,
+    "session_created": _parse_session_created,
+}
+
+
+# Optional binary wire format. msgspec ships a MessagePack codec, so the
+# binary path reuses the dependency already used for trusted DTO decoding:
+# integers and floats are read directly instead of re-parsed from digits,
+# and embedded binary output needs no base64 round trip. Negotiated per
+# response via content type; JSON stays the default for debuggability.
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+MSGPACK_AVAILABLE = msgspec is not None
+
+if msgspec is not None:
+    _MSGPACK_DECODER = msgspec.msgpack.Decoder()
+
+    # Typed whole-frame decoding for the three fixed success shapes. The
+    # tagged union lets msgspec pick the struct from the wire "type" field
+    # and write straight into C struct slots, skipping the intermediate
+    # dict-of-dicts that the generic JSON decoder would build. Anything
+    # the union does not recognize falls back to the dict path below.
+    class _ExecResultFrame(msgspec.Struct, tag_field="type", tag="code_execution_result"):
+        protocol_version: Optional[str] = None
+        session_id: Optional[str] = None
+        status: str = "success"
+        output: Dict[str, Any] = {}
+        metadata: Dict[str, Any] = {}
+        error: Optional[Dict[str, Any]] = None
+
+    class _GenResultFrame(msgspec.Struct, tag_field="type", tag="text_generation_result"):
+        protocol_version: Optional[str] = None
+        session_id: Optional[str] = None
+        status: str = "success"
+        output: Dict[str, Any] = {}
+        metadata: Dict[str, Any] = {}
+        error: Optional[Dict[str, Any]] = None
+
+    class _SessionCreatedFrame(msgspec.Struct, tag_field="type", tag="session_created"):
+        protocol_version: Optional[str] = None
+        session_id: str = ""
+        status: str = "success"
+        error: Optional[Dict[str, Any]] = None
+
+    _TYPED_FRAME_DECODER = msgspec.json.Decoder(
+        Union[_ExecResultFrame, _GenResultFrame, _SessionCreatedFrame]
+    )
+
+    def _convert_exec_frame(frame: "_ExecResultFrame") -> Dict[str, Any]:
+        try:
+            output = frame.output["execution_result"]
+        except (KeyError, TypeError):
+            output = _EMPTY
+        return {
+            "output": output.get("output", ""),
+            "exitCode": output.get("exit_code", 1),
+            "executionTime": output.get("execution_time", 0),
+            "memoryUsage": output.get("memory_usage", 0),
+            "metadata": frame.metadata
+        }
+
+    def _convert_gen_frame(frame: "_GenResultFrame") -> Dict[str, Any]:
+        usage = frame.metadata.get("usage") or _EMPTY
+        return {
+            "text": frame.output.get("text", ""),
+            "model": frame.metadata.get("model", "unknown"),
+            "generationTime": frame.metadata.get("generation_time", 0),
+            "usage": {
+                "promptTokens": usage.get("prompt_tokens", 0),
+                "completionTokens": usage.get("completion_tokens", 0),
+                "totalTokens": usage.get("total_tokens", 0)
+            }
+        }
+
+    def _convert_session_frame(frame: "_SessionCreatedFrame") -> Dict[str, Any]:
+        return {"session_id": frame.session_id}
+
+    _FRAME_CONVERTERS = {
+        _ExecResultFrame: _convert_exec_frame,
+        _GenResultFrame: _convert_gen_frame,
+        _SessionCreatedFrame: _convert_session_frame,
+    }
+else:
+    _MSGPACK_DECODER = None
+    _TYPED_FRAME_DECODER = None
+
+
+def decode_response_body(raw: bytes, content_type: Optional[str] = None) -> Dict[str, Any]:
+    """Decode a raw response body by content type and run protocol parsing.
+
+    MessagePack bodies are decoded with msgspec's C codec when the server
+    negotiated the binary format. JSON bodies first try the typed
+    tagged-union decoder, which parses the three fixed success shapes
+    directly into struct slots; error frames, unknown types and malformed
+    bodies fall back to the generic dict path so diagnostics are
+    identical to parse_response_message.
+
+    Args:
+        raw: The response body bytes.
+        content_type: The response content type, without parameters.
+
+    Returns:
+        The parsed response data, as from parse_response_message.
+
+    Raises:
+        MCPProtocolError: If the response contains an error or is invalid.
+    """
+    if content_type == MSGPACK_CONTENT_TYPE and _MSGPACK_DECODER is not None:
+        return parse_response_message(_MSGPACK_DECODER.decode(raw))
+    if _TYPED_FRAME_DECODER is not None:
+        try:
+            frame = _TYPED_FRAME_DECODER.decode(raw)
+        except msgspec.DecodeError:
+            pass
+        else:
+            if frame.protocol_version not in SUPPORTED_VERSIONS:
+                raise MCPProtocolError(f"Unsupported protocol version: {frame.protocol_version}")
+            if frame.error is None and frame.status != _ERROR:
+                return _FRAME_CONVERTERS[type(frame)](frame)
+    return parse_response_message(_json_loads(raw))
+
+
+# Per-type envelope templates holding only the constant fields. A dict.copy()
+# of a small fixed dict is one C-level clone, so the per-request build never
+# re-hashes the constant keys. Templates must never be mutated in place.
+_REQUEST_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    t.value: {"protocol_version": PROTOCOL_VERSION, "type": t.value}
+    for t in MCPRequestType
+}
+
+
 def build_request_message(type: str, session_id: Optional[str], input: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
     """Build a request message according to the MCP protocol.
 
@@ -267,12 +520,18 @@ def build_request_message(type: str, session_id: Optional[str], input: Dict[str,
     Returns:
         A dictionary containing the formatted request message.
     """
-    message = {
-        "protocol_version": PROTOCOL_VERSION,
-        "type": type,
-        "input": input,
-        "metadata": metadata
-    }
+    template = _REQUEST_TEMPLATES.get(type)
+    if template is not None:
+        # Copying the small constant template skips re-hashing the
+        # protocol_version/type keys on every build
+        message = template.copy()
+    else:
+        message = {
+            "protocol_version": PROTOCOL_VERSION,
+            "type": type,
+        }
+    message["input"] = input
+    message["metadata"] = metadata
 
     # Add session_id if provided
     if session_id:
@@ -281,6 +540,88 @@ def build_request_message(type: str, session_id: Optional[str], input: Dict[str,
     return message
 
 
+def _json_default(obj: Any) -> Any:
+    """Serialize pydantic models embedded in request messages."""
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# The protocol_version header never varies, so its encoded form is computed
+# once and spliced onto each outgoing frame instead of re-encoding the
+# constant per request. Encoded with the same codec used in to_bytes so
+# the byte format always matches.
+_PROTO_HEADER_BYTES = _json_dumps({"protocol_version": PROTOCOL_VERSION})[:-1]
+
+
+class _RequestMessage:
+    """Internal request envelope.
+
+    Slotted so pending requests are held in a fixed-size struct without a
+    per-instance __dict__; the envelope is only expanded to a dict at the
+    moment it is serialized.
+    """
+    __slots__ = ("type", "session_id", "input", "metadata")
+
+    def __init__(self, type: str, session_id: Optional[str], input: Any, metadata: Any):
+        self.type = type
+        self.session_id = session_id
+        self.input = input
+        self.metadata = metadata
+
+    def to_bytes(self) -> bytes:
+        """Serialize the envelope straight to JSON bytes."""
+        payload = {
+            "type": self.type,
+            "input": self.input,
+            "metadata": self.metadata
+        }
+        if self.session_id:
+            payload["session_id"] = self.session_id
+        body = _json_dumps(payload, default=_json_default)
+        # Splice the precomputed header in front of the body's first key
+        return _PROTO_HEADER_BYTES + b"," + body[1:]
+
+
+def encode_request_payload(data: Dict[str, Any]) -> bytes:
+    """Encode an already-built request dict straight to JSON bytes.
+
+    The constant protocol_version field is dropped from the dict and its
+    pre-encoded bytes are spliced onto the front of the frame, so the
+    constant is never re-serialized; embedded pydantic models (request
+    input/metadata) are handled by _json_default. This is the HTTP layer's
+    single encode step for request envelopes.
+
+    Args:
+        data: The request message dict (must contain at least "type").
+
+    Returns:
+        The JSON-encoded request as UTF-8 bytes.
+    """
+    data.pop("protocol_version", None)
+    body = _json_dumps(data, default=_json_default)
+    return _PROTO_HEADER_BYTES + b"," + body[1:]
+
+
+def build_request_message_bytes(type: str, session_id: Optional[str], input: Dict[str, Any], metadata: Dict[str, Any]) -> bytes:
+    """Build a request message and serialize it to JSON bytes.
+
+    Same message shape as build_request_message, serialized through the
+    shared _json codec (orjson when available). Returning
+    bytes lets the HTTP layer send the payload without re-encoding it.
+
+    Args:
+        type: The request type (e.g., "code_execution", "text_generation").
+        session_id: The session ID (can be None for session creation).
+        input: The input data for the request.
+        metadata: Additional metadata for the request.
+
+    Returns:
+        The JSON-encoded request message as UTF-8 bytes.
+    """
+    return _RequestMessage(type, session_id, input, metadata).to_bytes()
+
+
 def parse_response_message(response: Dict[str, Any]) -> Dict[str, Any]:
     """Parse a response message according to the MCP protocol.
 
@@ -293,59 +634,30 @@ def parse_response_message(response: Dict[str, Any]) -> Dict[str, Any]:
     Raises:
         MCPProtocolError: If the response contains an error or is invalid.
     """
-    from ..exceptions import MCPProtocolError
-    
     # Validate protocol version
     protocol_version = response.get("protocol_version")
     if protocol_version not in SUPPORTED_VERSIONS:
         raise MCPProtocolError(f"Unsupported protocol version: {protocol_version}")
 
-    # Check for error response
-    if response.get("status") == "error" or "error" in response:
-        error = response.get("error", {})
+    # Check for error response. The error payload is fetched first so the
+    # dominant success path pays exactly two dict lookups; a bare
+    # status=error with no payload still raises with the defaults.
+    error = response.get("error")
+    if error is None and response.get("status") == _ERROR:
+        error = _EMPTY
+    if error is not None:
         error_code = error.get("code", "unknown_error")
         error_message = error.get("message", "Unknown error occurred")
         error_details = error.get("details", {})
-        
+
         raise MCPProtocolError(
-            f"Error ({error_code}): {error_message}", 
+            f"Error ({error_code}): {error_message}",
             details=error_details
         )
 
-    # Parse response based on type
-    response_type = response.get("type")
-    
-    if response_type == MCPResponseType.CODE_EXECUTION_RESULT:
-        output = response.get("output", {}).get("execution_result", {})
-        return {
-            "output": output.get("output", ""),
-            "exitCode": output.get("exit_code", 1),
-            "executionTime": output.get("execution_time", 0),
-            "memoryUsage": output.get("memory_usage", 0),
-            "metadata": response.get("metadata", {})
-        }
-    
-    elif response_type == MCPResponseType.TEXT_GENERATION_RESULT:
-        output = response.get("output", {})
-        metadata = response.get("metadata", {})
-        usage = metadata.get("usage", {})
-        
-        return {
-            "text": output.get("text", ""),
-            "model": metadata.get("model", "unknown"),
-            "generationTime": metadata.get("generation_time", 0),
-            "usage": {
-                "promptTokens": usage.get("prompt_tokens", 0),
-                "completionTokens": usage.get("completion_tokens", 0),
-                "totalTokens": usage.get("total_tokens", 0)
-            }
-        }
-    
-    elif response_type == MCPResponseType.SESSION_CREATED:
-        return {
-            "session_id": response.get("session_id", "")
-        }
-    
-    else:
+    # Parse response based on type via the precomputed dispatch table
+    parser = _PARSERS.get(response.get("type"))
+    if parser is None:
         # For other response types, return the raw response
         return response
+    return parser(response)
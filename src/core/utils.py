@@ -1,9 +1,15 @@
 import os
 import json
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from .exceptions import MCPConfigError
 from .models import ExecutionResult, GenerationResult, TokenUsage
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
 
 def load_config_from_file(file_path: str) -> Dict[str, Any]:
     """Load configuration from a JSON file.
@@ -129,6 +135,23 @@ def validate_language(language: str, allowed_languages: List[str]) -> bool:
     raise ValueError(f"Unsupported language: {language}. Allowed languages: {', '.join(allowed_languages)}")
 
 
+if ahocorasick is not None:
+    @lru_cache(maxsize=32)
+    def _blocked_automaton(keywords):
+        """Compile a keyword tuple into an Aho-Corasick automaton.
+
+        One DFA pass over the code replaces a substring search per keyword;
+        memoized because configs reuse the same keyword list per process.
+        """
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword.lower(), keyword)
+        automaton.make_automaton()
+        return automaton
+else:
+    _blocked_automaton = None
+
+
 def validate_code(code: str, max_length: int, blocked_keywords: List[str]) -> bool:
     """Validate that the code meets security requirements.
 
@@ -148,9 +171,16 @@ def validate_code(code: str, max_length: int, blocked_keywords: List[str]) -> bo
         raise ValueError(f"Code length ({len(code)}) exceeds maximum length ({max_length})")
     
     # Check for blocked keywords
-    for keyword in blocked_keywords:
-        if keyword.lower() in code.lower():
-            raise ValueError(f"Code contains blocked keyword: {keyword}")
+    if blocked_keywords:
+        lowered = code.lower()
+        if _blocked_automaton is not None:
+            for _, keyword in _blocked_automaton(tuple(blocked_keywords)).iter(lowered):
+                raise ValueError(f"Code contains blocked keyword: {keyword}")
+        else:
+            # Fallback: still lowercase the code once, not once per keyword
+            for keyword in blocked_keywords:
+                if keyword.lower() in lowered:
+                    raise ValueError(f"Code contains blocked keyword: {keyword}")
     
     return True
 
@@ -23,7 +23,6 @@ from src.core.protocols.mcp import (
     CodeExecutionInput,
     CodeExecutionRequest,
     ExecutionResultOutput,
-    CodeExecutionOutput,
     CodeExecutionResultResponse,
     TextGenerationInput,
     TextGenerationMetadata,
@@ -120,15 +119,14 @@ class TestMCPProtocolModels:
             execution_time=100,
             memory_usage=10
         )
-        output = CodeExecutionOutput(execution_result=execution_result)
         response = CodeExecutionResultResponse(
             session_id="test_session",
-            output=output
+            output=execution_result
         )
         assert response.type == MCPResponseType.CODE_EXECUTION_RESULT
         assert response.session_id == "test_session"
-        assert response.output.execution_result.output == "Hello, world!\n"
-        assert response.output.execution_result.exit_code == 0
+        assert response.output["output"] == "Hello, world!\n"
+        assert response.output["exit_code"] == 0
 
     def test_text_generation_request(self):
         """Test the text generation request model."""
@@ -171,20 +169,20 @@ class TestMCPProtocolModels:
         assert response.type == MCPResponseType.TEXT_GENERATION_RESULT
         assert response.session_id == "test_session"
         assert response.output.text == "AI is a technology that..."
-        assert response.metadata.model == "deepseek-v3"
-        assert response.metadata.usage.prompt_tokens == 10
-        assert response.metadata.usage.completion_tokens == 50
-        assert response.metadata.usage.total_tokens == 60
+        assert response.metadata["model"] == "deepseek-v3"
+        assert response.metadata["usage"]["prompt_tokens"] == 10
+        assert response.metadata["usage"]["completion_tokens"] == 50
+        assert response.metadata["usage"]["total_tokens"] == 60
 
     def test_stream_generation_chunk(self):
         """Test the stream generation chunk model."""
         chunk = TextGenerationStreamChunk(text="AI", done=False)
-        assert chunk.text == "AI"
-        assert chunk.done is False
+        assert chunk["text"] == "AI"
+        assert chunk["done"] is False
 
         final_chunk = TextGenerationStreamChunk(text="AI is a technology", done=True)
-        assert final_chunk.text == "AI is a technology"
-        assert final_chunk.done is True
+        assert final_chunk["text"] == "AI is a technology"
+        assert final_chunk["done"] is True
 
     def test_cancel_execution_request(self):
         """Test the cancel execution request model."""
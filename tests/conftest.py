@@ -1,5 +1,7 @@
 import pytest
+import pytest_asyncio
 import asyncio
+import itertools
 import json
 from typing import Dict, Any, List, Optional
 from aiohttp import web
@@ -22,13 +24,16 @@ class MockServer:
         self.error_mode = False
         self.error_status = 500
         self.error_message = "Internal Server Error"
+        self.error_fail_count: Optional[int] = None
 
     async def start(self):
         self.runner = web.AppRunner(self.app)
         await self.runner.setup()
         self.site = web.TCPSite(self.runner, "localhost", 0)
         await self.site.start()
-        self.url = f"http://localhost:{self.site._server.sockets[0].getsockname()[1]}"
+        # Clients append endpoint paths such as /sessions, so the base URL
+        # carries the /v1 prefix the routes are registered under
+        self.url = f"http://localhost:{self.site._server.sockets[0].getsockname()[1]}/v1"
         return self
 
     async def stop(self):
@@ -45,11 +50,35 @@ class MockServer:
         """Set a custom response for a specific path."""
         self.responses[path] = response
 
-    def set_error_mode(self, enabled: bool, status: int = 500, message: str = "Internal Server Error"):
-        """Enable or disable error mode."""
+    def set_error_mode(self, enabled: bool, status: int = 500, message: str = "Internal Server Error",
+                       fail_count: Optional[int] = None):
+        """Enable or disable error mode.
+
+        If fail_count is given, only that many requests fail before error
+        mode switches itself back off.
+        """
         self.error_mode = enabled
         self.error_status = status
         self.error_message = message
+        self.error_fail_count = fail_count
+
+    def reset(self):
+        """Restore default behavior and clear recorded state between tests."""
+        self.delay = 0.0
+        self.error_mode = False
+        self.error_fail_count = None
+        self.responses.clear()
+        self.requests = []
+
+    def _error_response(self):
+        if self.error_fail_count is not None:
+            self.error_fail_count -= 1
+            if self.error_fail_count <= 0:
+                self.error_mode = False
+        return web.json_response(
+            {"error": {"message": self.error_message}},
+            status=self.error_status
+        )
 
     def get_requests(self) -> List[Dict[str, Any]]:
         """Get all received requests."""
@@ -68,10 +97,7 @@ class MockServer:
         self.requests.append({"path": "/v1/execute", "body": body})
 
         if self.error_mode:
-            return web.json_response(
-                {"error": {"message": self.error_message}},
-                status=self.error_status
-            )
+            return self._error_response()
 
         if "/v1/execute" in self.responses:
             return web.json_response(self.responses["/v1/execute"])
@@ -128,10 +154,7 @@ class MockServer:
         self.requests.append({"path": "/v1/generate", "body": body})
 
         if self.error_mode:
-            return web.json_response(
-                {"error": {"message": self.error_message}},
-                status=self.error_status
-            )
+            return self._error_response()
 
         if "/v1/generate" in self.responses:
             return web.json_response(self.responses["/v1/generate"])
@@ -166,10 +189,7 @@ class MockServer:
         self.requests.append({"path": "/v1/sessions", "body": body})
 
         if self.error_mode:
-            return web.json_response(
-                {"error": {"message": self.error_message}},
-                status=self.error_status
-            )
+            return self._error_response()
 
         if "/v1/sessions" in self.responses:
             return web.json_response(self.responses["/v1/sessions"])
@@ -184,15 +204,55 @@ class MockServer:
         })
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def mock_server():
-    """Fixture that provides a mock server for testing."""
+    """Fixture that provides a mock server, shared by the whole test session.
+
+    Starting the aiohttp runner is by far the most expensive part of these
+    tests, so one server outlives all modules; the autouse
+    reset_mock_server fixture puts its knobs back between tests.
+    """
     server = MockServer()
     await server.start()
     yield server
     await server.stop()
 
 
+@pytest.fixture
+def fast_sleep(monkeypatch):
+    """Collapse sleeps to a bare event-loop yield.
+
+    Opt-in for retry tests, where the client's exponential backoff otherwise
+    burns real wall-clock time. Not for timeout tests: those rely on the
+    mock server's delayed responses, which also go through asyncio.sleep.
+    """
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda delay, *args, **kwargs: real_sleep(0))
+
+
+@pytest.fixture(autouse=True)
+def deterministic_request_ids(monkeypatch):
+    """Make request IDs deterministic (and free) for every test.
+
+    The client draws request IDs from os.urandom; a counter avoids the
+    per-request RNG syscall and makes recorded requests reproducible.
+    """
+    counter = itertools.count(1)
+    monkeypatch.setattr(
+        "src.core.async_client.os.urandom",
+        lambda n: next(counter).to_bytes(n, "big"),
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_mock_server(request):
+    """Reset the shared server's delay/error/response state after each test."""
+    yield
+    if "mock_server" in request.fixturenames:
+        server = request.getfixturevalue("mock_server")
+        server.reset()
+
+
 @pytest.fixture
 def event_loop():
     """Create an instance of the default event loop for each test."""
@@ -1,10 +1,12 @@
 import pytest
 import asyncio
 from src.core.async_client import DeepExecAsyncClient
-from src.core.exceptions import MCPAuthError
+from src.core.exceptions import MCPAuthError, MCPConnectionError
+
+# All tests share the session-scoped mock_server's event loop
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
-@pytest.mark.asyncio
 async def test_successful_authentication(mock_server):
     """Test successful authentication with valid API keys."""
     async with DeepExecAsyncClient(
@@ -18,7 +20,6 @@ async def test_successful_authentication(mock_server):
         assert isinstance(session_id, str)
 
 
-@pytest.mark.asyncio
 async def test_invalid_deepseek_key(mock_server):
     """Test authentication failure with invalid DeepSeek API key."""
     # Configure the mock server to return an auth error for invalid keys
@@ -34,11 +35,7 @@ async def test_invalid_deepseek_key(mock_server):
 
     assert "Invalid authentication credentials" in str(exc_info.value)
 
-    # Reset the mock server for other tests
-    mock_server.set_error_mode(False)
-
 
-@pytest.mark.asyncio
 async def test_invalid_e2b_key(mock_server):
     """Test authentication failure with invalid E2B API key."""
     # Configure the mock server to return an auth error for invalid keys
@@ -54,11 +51,7 @@ async def test_invalid_e2b_key(mock_server):
 
     assert "Invalid E2B API key" in str(exc_info.value)
 
-    # Reset the mock server for other tests
-    mock_server.set_error_mode(False)
 
-
-@pytest.mark.asyncio
 async def test_missing_api_keys(mock_server):
     """Test authentication failure with missing API keys."""
     with pytest.raises(MCPAuthError) as exc_info:
@@ -71,7 +64,6 @@ async def test_missing_api_keys(mock_server):
     assert "API key" in str(exc_info.value)
 
 
-@pytest.mark.asyncio
 async def test_token_expiration_and_refresh(mock_server):
     """Test token expiration and automatic refresh."""
     # First request succeeds
@@ -93,22 +85,22 @@ async def test_token_expiration_and_refresh(mock_server):
         assert "hello" in result.output
 
 
-@pytest.mark.asyncio
-async def test_rate_limiting(mock_server):
+async def test_rate_limiting(mock_server, fast_sleep):
     """Test handling of rate limiting errors."""
-    # Configure the mock server to return a rate limit error
-    mock_server.set_error_mode(True, 429, "Rate limit exceeded")
-
     async with DeepExecAsyncClient(
         endpoint=mock_server.url,
         deepseek_key="valid_key",
-        e2b_key="valid_e2b_key"
+        e2b_key="valid_e2b_key",
+        max_retries=1,
+        retry_delay=0.01
     ) as client:
-        # This should implement retry with backoff
-        with pytest.raises(MCPAuthError) as exc_info:
-            await client.execute_code("print('hello')", "python")
+        await client.create_session("test_user")
 
-        assert "Rate limit exceeded" in str(exc_info.value)
+        # Configure the mock server to return a rate limit error
+        mock_server.set_error_mode(True, 429, "Rate limit exceeded")
+
+        # The client retries with backoff, then surfaces a connection error
+        with pytest.raises(MCPConnectionError) as exc_info:
+            await client.execute_code("print('hello')", "python")
 
-    # Reset the mock server for other tests
-    mock_server.set_error_mode(False)
+        assert "429" in str(exc_info.value)
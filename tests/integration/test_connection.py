@@ -4,9 +4,11 @@ import aiohttp
 from src.core.async_client import DeepExecAsyncClient
 from src.core.exceptions import MCPConnectionError, MCPTimeoutError
 
+# All tests share the session-scoped mock_server's event loop
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-@pytest.mark.asyncio
-async def test_connection_retry(mock_server):
+
+async def test_connection_retry(mock_server, fast_sleep):
     """Test connection retry mechanism when server is temporarily unavailable."""
     # Configure the mock server to be temporarily unavailable
     mock_server.set_error_mode(True, 503, "Service Unavailable")
@@ -14,6 +16,8 @@ async def test_connection_retry(mock_server):
     # Set the client to retry a few times
     async with DeepExecAsyncClient(
         endpoint=mock_server.url,
+        deepseek_key="test_key",
+        e2b_key="test_e2b_key",
         max_retries=3,
         retry_delay=0.1  # Short delay for testing
     ) as client:
@@ -23,12 +27,8 @@ async def test_connection_retry(mock_server):
 
         assert "Service Unavailable" in str(exc_info.value)
 
-    # Reset the mock server for other tests
-    mock_server.set_error_mode(False)
-
 
-@pytest.mark.asyncio
-async def test_connection_recovery(mock_server):
+async def test_connection_recovery(mock_server, fast_sleep):
     """Test connection recovery after temporary failure."""
     # Configure the mock server to fail once then recover
     mock_server.set_error_mode(True, 503, "Service Unavailable", fail_count=1)
@@ -36,6 +36,8 @@ async def test_connection_recovery(mock_server):
     # Set the client to retry
     async with DeepExecAsyncClient(
         endpoint=mock_server.url,
+        deepseek_key="test_key",
+        e2b_key="test_e2b_key",
         max_retries=3,
         retry_delay=0.1  # Short delay for testing
     ) as client:
@@ -44,31 +46,35 @@ async def test_connection_recovery(mock_server):
         assert session_id is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.slow
 async def test_connection_timeout(mock_server):
     """Test connection timeout handling."""
-    # Configure the mock server to delay responses
-    mock_server.set_delay(5.0)  # 5 second delay
+    # Configure the mock server to delay responses past the client timeout
+    mock_server.set_delay(1.0)
 
-    # Set a short timeout
+    # Set a short timeout and no retries so only one timeout is paid
     async with DeepExecAsyncClient(
         endpoint=mock_server.url,
-        timeout=0.5  # 0.5 second timeout
+        deepseek_key="test_key",
+        e2b_key="test_e2b_key",
+        timeout=0.3,
+        max_retries=0
     ) as client:
         with pytest.raises(MCPTimeoutError) as exc_info:
             await client.create_session("test_user")
 
         assert "timed out" in str(exc_info.value).lower()
 
-    # Reset the mock server for other tests
-    mock_server.set_delay(0)
-
 
-@pytest.mark.asyncio
-async def test_concurrent_connections(mock_server):
-    """Test multiple concurrent connections to the server."""
+@pytest.mark.parametrize("n", [1, 5])
+async def test_concurrent_connections(mock_server, n):
+    """Test single and multiple concurrent connections to the server."""
     async def create_and_use_client(user_id):
-        async with DeepExecAsyncClient(endpoint=mock_server.url) as client:
+        async with DeepExecAsyncClient(
+            endpoint=mock_server.url,
+            deepseek_key="test_key",
+            e2b_key="test_e2b_key"
+        ) as client:
             session_id = await client.create_session(f"user_{user_id}")
             assert session_id is not None
             result = await client.execute_code(f"print('Hello from user {user_id}')", "python")
@@ -76,19 +82,24 @@ async def test_concurrent_connections(mock_server):
             assert f"Hello from user {user_id}" in result.output
             return user_id
 
-    # Create multiple concurrent clients
-    tasks = [create_and_use_client(i) for i in range(5)]
+    # Create the concurrent clients; gather keeps 3.8 compatibility where
+    # asyncio.TaskGroup would not
+    tasks = [create_and_use_client(i) for i in range(n)]
     results = await asyncio.gather(*tasks)
 
     # Verify all clients completed successfully
-    assert sorted(results) == list(range(5))
+    assert sorted(results) == list(range(n))
 
 
-@pytest.mark.asyncio
-async def test_connection_with_invalid_endpoint(mock_server):
+async def test_connection_with_invalid_endpoint(mock_server, fast_sleep):
     """Test connection to an invalid endpoint."""
-    # Use a non-existent endpoint
-    async with DeepExecAsyncClient(endpoint="http://non-existent-endpoint:12345") as client:
+    # Port 1 is reserved, so the connect fails with an immediate refusal
+    # instead of waiting out a DNS lookup for a fake hostname
+    async with DeepExecAsyncClient(
+        endpoint="http://127.0.0.1:1",
+        deepseek_key="test_key",
+        e2b_key="test_e2b_key"
+    ) as client:
         with pytest.raises(MCPConnectionError) as exc_info:
             await client.create_session("test_user")
 
@@ -96,10 +107,13 @@ async def test_connection_with_invalid_endpoint(mock_server):
         assert "connection" in str(exc_info.value).lower()
 
 
-@pytest.mark.asyncio
 async def test_graceful_shutdown(mock_server):
     """Test graceful shutdown of the client connection."""
-    client = DeepExecAsyncClient(endpoint=mock_server.url)
+    client = DeepExecAsyncClient(
+        endpoint=mock_server.url,
+        deepseek_key="test_key",
+        e2b_key="test_e2b_key"
+    )
     
     # Open the connection
     await client.__aenter__()
@@ -112,9 +126,8 @@ async def test_graceful_shutdown(mock_server):
     
     # Close the connection gracefully
     await client.__aexit__(None, None, None)
-    
-    # Verify the client is closed by attempting to use it (should fail)
-    with pytest.raises(MCPConnectionError) as exc_info:
-        await client.execute_code("print('should fail')", "python")
-    
-    assert "no active session" in str(exc_info.value).lower()
+
+    # Verify closure by state instead of an extra round-trip; the
+    # raises-after-close behavior is covered by the no-session unit cases
+    assert client.session_id is None
+    assert client.session is None or client.session.closed
@@ -1,29 +1,51 @@
 import pytest
+import pytest_asyncio
 import asyncio
 from src.core.async_client import DeepExecAsyncClient
 from src.core.exceptions import MCPTimeoutError, MCPExecutionError
 
+# All tests share the session-scoped mock_server's event loop
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-@pytest.mark.asyncio
-async def test_code_execution_happy_path(mock_server):
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def shared_client(mock_server):
+    """One connected client with an open session for the whole module."""
+    async with DeepExecAsyncClient(
+        endpoint=mock_server.url,
+        deepseek_key="test_key",
+        e2b_key="test_e2b_key"
+    ) as client:
+        await client.create_session("test_user")
+        yield client
+
+
+async def test_code_execution_happy_path(shared_client):
     """Test successful code execution with the async client."""
-    async with DeepExecAsyncClient(endpoint=mock_server.url) as client:
-        result = await client.execute_code("print('hello')", "python")
-        assert result.output == "hello\n"
-        assert result.exit_code == 0
+    result = await shared_client.execute_code("print('hello')", "python")
+    assert result.output == "hello\n"
+    assert result.exit_code == 0
 
 
-@pytest.mark.asyncio
+@pytest.mark.slow
 async def test_code_execution_timeout(mock_server):
     """Test code execution timeout with the async client."""
-    mock_server.set_delay(10.0)  # Set server delay
-    async with DeepExecAsyncClient(endpoint=mock_server.url, timeout=1.0) as client:
+    # A custom timeout needs its own client; the session is created before
+    # the delay is armed so only execute_code runs against the slow server
+    async with DeepExecAsyncClient(
+        endpoint=mock_server.url,
+        deepseek_key="test_key",
+        e2b_key="test_e2b_key",
+        timeout=0.3,
+        max_retries=0
+    ) as client:
+        await client.create_session("test_user")
+        mock_server.set_delay(1.0)
         with pytest.raises(MCPTimeoutError):
             await client.execute_code("import time; time.sleep(5)", "python")
 
 
-@pytest.mark.asyncio
-async def test_code_execution_error(mock_server):
+async def test_code_execution_error(mock_server, shared_client):
     """Test code execution that results in an error."""
     # Configure the mock server to return an error
     mock_server.set_response("/v1/execute", {
@@ -42,64 +64,40 @@ async def test_code_execution_error(mock_server):
         }
     })
 
-    async with DeepExecAsyncClient(endpoint=mock_server.url) as client:
-        result = await client.execute_code("1/0", "python")
-        assert result.exit_code == 1
-        assert "Division by zero" in result.output
-
-
-@pytest.mark.asyncio
-async def test_multiple_concurrent_executions(mock_server):
-    """Test running multiple code executions concurrently."""
-    async with DeepExecAsyncClient(endpoint=mock_server.url) as client:
-        tasks = [
-            client.execute_code(f"print({i})", "python")
-            for i in range(5)
-        ]
-        results = await asyncio.gather(*tasks)
-
-        # Verify all results
-        for i, result in enumerate(results):
-            assert result.exit_code == 0
-            assert str(i) in result.output
-
-
-@pytest.mark.asyncio
-async def test_code_execution_with_different_languages(mock_server):
-    """Test code execution with different programming languages."""
-    async with DeepExecAsyncClient(endpoint=mock_server.url) as client:
-        # Python
-        python_result = await client.execute_code("print('Python')", "python")
-        assert python_result.exit_code == 0
-        assert "Python" in python_result.output
-
-        # JavaScript
-        js_result = await client.execute_code("console.log('JavaScript')", "javascript")
-        assert js_result.exit_code == 0
-        assert "JavaScript" in js_result.output
-
-
-@pytest.mark.asyncio
-async def test_code_execution_with_environment_variables(mock_server):
-    """Test code execution with custom environment variables."""
-    async with DeepExecAsyncClient(endpoint=mock_server.url) as client:
-        result = await client.execute_code(
-            "import os; print(os.environ.get('TEST_VAR', 'not set'))",
-            "python",
-            environment={"TEST_VAR": "test_value"}
-        )
-        assert result.exit_code == 0
-        assert "test_value" in result.output
-
-
-@pytest.mark.asyncio
-async def test_code_execution_with_working_directory(mock_server):
-    """Test code execution with a custom working directory."""
-    async with DeepExecAsyncClient(endpoint=mock_server.url) as client:
-        result = await client.execute_code(
-            "import os; print(os.getcwd())",
-            "python",
-            working_directory="/custom/path"
-        )
+    result = await shared_client.execute_code("1/0", "python")
+    assert result.exit_code == 1
+    assert "Division by zero" in result.output
+
+
+async def test_code_execution_variants_batch(mock_server, shared_client):
+    """Test the language/environment/cwd variants through one client session.
+
+    The concurrent, per-language, environment and working-directory cases
+    previously each opened their own client (TCP connect plus session
+    handshake); batching them through execute_many pays that setup once.
+    """
+    items = [
+        {"code": f"print({i})", "language": "python"} for i in range(5)
+    ] + [
+        {"code": "print('Python')", "language": "python"},
+        {"code": "console.log('JavaScript')", "language": "javascript"},
+        {"code": "import os; print(os.environ.get('TEST_VAR', 'not set'))",
+         "language": "python", "environment": {"TEST_VAR": "test_value"}},
+        {"code": "import os; print(os.getcwd())",
+         "language": "python", "working_directory": "/custom/path"},
+    ]
+
+    results = await shared_client.execute_many(items, concurrency=4)
+
+    assert len(results) == len(items)
+    for i, result in enumerate(results[:5]):
         assert result.exit_code == 0
-        assert "/custom/path" in result.output
+        assert str(i) in result.output
+    assert "Python" in results[5].output
+    assert all(result.exit_code == 0 for result in results)
+
+    # The per-item options must still reach the wire individually
+    bodies = [r["body"] for r in mock_server.get_requests() if r["path"] == "/v1/execute"]
+    assert len(bodies) == len(items)
+    assert any(b["input"].get("environment") == {"TEST_VAR": "test_value"} for b in bodies)
+    assert any(b["input"].get("working_directory") == "/custom/path" for b in bodies)
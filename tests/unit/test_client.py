@@ -1,7 +1,7 @@
 import pytest
 import os
 import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from src.DeepExecClient import DeepExecClient
 from src.core.exceptions import (
     MCPError,
@@ -14,16 +14,40 @@ from src.core.exceptions import (
 )
 
 
+@pytest.fixture(scope="module")
+def base_client():
+    """Build the client once per module; construction dominates these tests."""
+    return DeepExecClient({
+        "deepseekKey": "test_key",
+        "e2bKey": "test_e2b_key"
+    })
+
+
+@pytest.fixture
+def client(base_client):
+    """Hand each test the shared client with per-test state reset."""
+    base_client.sessionId = None
+    base_client.config.securityOptions = {}
+    return base_client
+
+
+@pytest.fixture(scope="module")
+def _send_patch():
+    """Install the _send_request patch once for the whole module."""
+    with patch("src.DeepExecClient.DeepExecClient._send_request") as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_send(_send_patch):
+    """Hand each test the shared mock with its state wiped."""
+    _send_patch.reset_mock(return_value=True, side_effect=True)
+    return _send_patch
+
+
 class TestDeepExecClient:
     """Unit tests for the DeepExecClient class."""
 
-    def setup_method(self):
-        """Set up test environment before each test method."""
-        self.client = DeepExecClient({
-            "deepseekKey": "test_key",
-            "e2bKey": "test_e2b_key"
-        })
-
     def test_init_with_valid_config(self):
         """Test client initialization with valid configuration."""
         client = DeepExecClient({
@@ -41,18 +65,17 @@ class TestDeepExecClient:
                 "timeout": "invalid_timeout"  # Should be a number
             })
 
-    def test_create_session(self):
+    def test_create_session(self, client):
         """Test session creation."""
-        session_id = self.client.createSession("test_user")
+        session_id = client.createSession("test_user")
         assert session_id is not None
         assert isinstance(session_id, str)
-        assert self.client.sessionId == session_id
+        assert client.sessionId == session_id
 
-    @patch("src.DeepExecClient.DeepExecClient._send_request")
-    def test_execute_code_success(self, mock_send_request):
+    def test_execute_code_success(self, client, mock_send):
         """Test successful code execution."""
         # Mock the response from the server
-        mock_send_request.return_value = {
+        mock_send.return_value = {
             "output": "Hello, World!\n",
             "exitCode": 0,
             "executionTime": 100,
@@ -61,10 +84,10 @@ class TestDeepExecClient:
         }
 
         # Create a session first
-        self.client.createSession("test_user")
+        client.createSession("test_user")
 
         # Execute code
-        result = self.client.executeCode("print('Hello, World!')", "python")
+        result = client.executeCode("print('Hello, World!')", "python")
 
         # Verify the result
         assert result.output == "Hello, World!\n"
@@ -73,54 +96,60 @@ class TestDeepExecClient:
         assert result.memoryUsage == 10
         assert result.metadata["language"] == "python"
 
-    def test_execute_code_no_session(self):
-        """Test code execution without an active session."""
-        with pytest.raises(MCPProtocolError) as exc_info:
-            self.client.executeCode("print('Hello, World!')", "python")
-        assert "No active session" in str(exc_info.value)
-
-    def test_execute_code_empty_code(self):
-        """Test code execution with empty code."""
-        # Create a session first
-        self.client.createSession("test_user")
+    @pytest.mark.parametrize(
+        "needs_session,call,expected_msg",
+        [
+            pytest.param(False, lambda c: c.executeCode("print('x')", "python"),
+                         "No active session", id="execute-no-session"),
+            pytest.param(False, lambda c: c.generateText("Test prompt"),
+                         "No active session", id="generate-no-session"),
+            pytest.param(True, lambda c: c.executeCode("", "python"),
+                         "Code cannot be empty", id="execute-empty-code"),
+            pytest.param(True, lambda c: c.generateText(""),
+                         "Prompt cannot be empty", id="generate-empty-prompt"),
+        ],
+    )
+    def test_invalid_call_state(self, client, needs_session, call, expected_msg):
+        """Test that missing sessions and empty inputs raise protocol errors."""
+        if needs_session:
+            client.createSession("test_user")
 
         with pytest.raises(MCPProtocolError) as exc_info:
-            self.client.executeCode("", "python")
-        assert "Code cannot be empty" in str(exc_info.value)
+            call(client)
+        assert expected_msg in str(exc_info.value)
 
-    def test_execute_code_invalid_language(self):
+    def test_execute_code_invalid_language(self, client):
         """Test code execution with an invalid language."""
         # Create a session first
-        self.client.createSession("test_user")
+        client.createSession("test_user")
 
         # Set allowed languages in the config
-        self.client.config.securityOptions = {
+        client.config.securityOptions = {
             "allowedLanguages": ["python", "javascript"]
         }
 
         with pytest.raises(MCPProtocolError) as exc_info:
-            self.client.executeCode("print('Hello, World!')", "invalid_language")
+            client.executeCode("print('Hello, World!')", "invalid_language")
         assert "not supported" in str(exc_info.value)
 
-    def test_execute_code_blocked_keywords(self):
+    def test_execute_code_blocked_keywords(self, client):
         """Test code execution with blocked keywords."""
         # Create a session first
-        self.client.createSession("test_user")
+        client.createSession("test_user")
 
         # Set blocked keywords in the config
-        self.client.config.securityOptions = {
+        client.config.securityOptions = {
             "blockedKeywords": ["rm -rf", "os.system"]
         }
 
         with pytest.raises(MCPProtocolError) as exc_info:
-            self.client.executeCode("import os; os.system('ls')", "python")
+            client.executeCode("import os; os.system('ls')", "python")
         assert "blocked keyword" in str(exc_info.value)
 
-    @patch("src.DeepExecClient.DeepExecClient._send_request")
-    def test_generate_text_success(self, mock_send_request):
+    def test_generate_text_success(self, client, mock_send):
         """Test successful text generation."""
         # Mock the response from the server
-        mock_send_request.return_value = {
+        mock_send.return_value = {
             "text": "Generated text response",
             "model": "deepseek-v3",
             "generationTime": 500,
@@ -132,10 +161,10 @@ class TestDeepExecClient:
         }
 
         # Create a session first
-        self.client.createSession("test_user")
+        client.createSession("test_user")
 
         # Generate text
-        result = self.client.generateText("Test prompt")
+        result = client.generateText("Test prompt")
 
         # Verify the result
         assert result.text == "Generated text response"
@@ -145,36 +174,22 @@ class TestDeepExecClient:
         assert result.usage.completionTokens == 50
         assert result.usage.totalTokens == 60
 
-    def test_generate_text_no_session(self):
-        """Test text generation without an active session."""
-        with pytest.raises(MCPProtocolError) as exc_info:
-            self.client.generateText("Test prompt")
-        assert "No active session" in str(exc_info.value)
-
-    def test_generate_text_empty_prompt(self):
-        """Test text generation with an empty prompt."""
-        # Create a session first
-        self.client.createSession("test_user")
-
-        with pytest.raises(MCPProtocolError) as exc_info:
-            self.client.generateText("")
-        assert "Prompt cannot be empty" in str(exc_info.value)
-
-    @patch("src.DeepExecClient.DeepExecClient._send_request")
-    def test_stream_generate_text(self, mock_send_request):
+    def test_stream_generate_text(self, client, monkeypatch):
         """Test streaming text generation."""
         # This is a simplified test since we can't easily test generators in unit tests
         # Create a session first
-        self.client.createSession("test_user")
+        client.createSession("test_user")
 
-        # Mock the generator function
-        self.client.streamGenerateText = MagicMock(return_value=iter([
+        # Stub the generator function with a plain lambda; MagicMock's
+        # attribute proxying and call recording are overhead this test
+        # never inspects (monkeypatch undoes this on the shared client)
+        monkeypatch.setattr(client, "streamGenerateText", lambda prompt: iter([
             {"text": "Hello", "done": False},
             {"text": " World", "done": True}
         ]))
 
         # Get the generator
-        generator = self.client.streamGenerateText("Test prompt")
+        generator = client.streamGenerateText("Test prompt")
 
         # Consume the generator
         chunks = list(generator)
@@ -186,12 +201,12 @@ class TestDeepExecClient:
         assert chunks[1]["text"] == " World"
         assert chunks[1]["done"] is True
 
-    def test_close(self):
+    def test_close(self, client):
         """Test client closure."""
         # Create a session first
-        self.client.createSession("test_user")
-        assert self.client.sessionId is not None
+        client.createSession("test_user")
+        assert client.sessionId is not None
 
         # Close the client
-        self.client.close()
-        assert self.client.sessionId is None
+        client.close()
+        assert client.sessionId is None